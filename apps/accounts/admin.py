@@ -1,8 +1,10 @@
 from django.contrib import admin
 from apps.accounts.models import (
     Action,
+    KnownDevice,
     Profile,
     LoginHistory,
+    LoginHistoryRollup,
 )
 
 
@@ -26,3 +28,16 @@ class ActionAdmin(admin.ModelAdmin):
 @admin.register(LoginHistory)
 class LoginHistoryAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(LoginHistoryRollup)
+class LoginHistoryRollupAdmin(admin.ModelAdmin):
+    list_display = ["user", "date", "logins"]
+    list_filter = ["date"]
+    search_fields = ["user__username", "user__email"]
+
+
+@admin.register(KnownDevice)
+class KnownDeviceAdmin(admin.ModelAdmin):
+    list_display = ["user", "browser_family", "os", "device", "created"]
+    search_fields = ["user__username", "user__email"]
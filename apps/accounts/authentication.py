@@ -1,10 +1,26 @@
-from django.contrib.auth.backends import BaseBackend
+from django.contrib.auth.backends import BaseBackend, ModelBackend
 
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
+def get_user_with_related(user_id):
+    """Load a user with their profile and wallet in a single query."""
+    try:
+        return User.objects.select_related("profile", "wallet").get(pk=user_id)
+    except User.DoesNotExist:
+        return None
+
+
+class UserModelBackend(ModelBackend):
+    """Authenticate with the username, loading the profile and wallet too."""
+
+    def get_user(self, user_id):
+        user = get_user_with_related(user_id)
+        return user if user and self.user_can_authenticate(user) else None
+
+
 class EmailAuthenticationBackend(BaseBackend):
     """Authenticate using e-mail account."""
 
@@ -19,7 +35,4 @@ class EmailAuthenticationBackend(BaseBackend):
         return None
 
     def get_user(self, user_id):
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return None
+        return get_user_with_related(user_id)
@@ -0,0 +1,80 @@
+"""Totals of the admin dashboard, computed in one pass per model and cached."""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from apps.accounts.models import Profile
+from apps.groups.models import Bundle, Group, Payout, Purchase
+from apps.tickets.models import Ticket
+
+DASHBOARD_CACHE_KEY = "admin-dashboard-stats"
+# Seconds the totals stay cached; saves of the models counted clear them.
+DASHBOARD_CACHE_TIMEOUT = 60
+
+
+def compute_dashboard_stats():
+    """
+    Count the groups, bundles, tickets and bettors, sum the approved
+    purchases and payouts, and rank the top 5 bundles by staked amount.
+
+    Each model is read with a single conditional aggregate.
+
+    Returns:
+        dict: The totals, by dashboard context name.
+    """
+    stats = {}
+    stats.update(
+        Group.objects.aggregate(
+            total_groups=Count("id"),
+            running_groups=Count("id", filter=Q(status=Group.Status.RUNNING)),
+        )
+    )
+    stats.update(
+        Bundle.objects.aggregate(
+            total_bundles=Count("id"),
+            pending_bundles=Count("id", filter=Q(status=Bundle.Status.PENDING)),
+        )
+    )
+    stats.update(
+        Ticket.objects.aggregate(
+            total_tickets=Count("id"),
+            pending_tickets=Count("id", filter=Q(status=Ticket.Status.PENDING)),
+        )
+    )
+    stats.update(
+        Profile.objects.filter(user__is_staff=False).aggregate(
+            total_users=Count("id"),
+            active_users=Count("id", filter=Q(email_confirmed=True)),
+        )
+    )
+
+    approved_purchases = Purchase.objects.filter(status=Purchase.Status.APPROVED)
+    stats["total_purchases"] = approved_purchases.aggregate(total=Sum("amount"))[
+        "total"
+    ] or Decimal("0.00")
+    stats["total_payouts"] = Payout.objects.filter(
+        status=Payout.Status.APPROVED
+    ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
+
+    # Get the top 5 bundles based on staked amount
+    stats["top_bundles"] = list(
+        approved_purchases.values("bundle__name", "bundle__group__name")
+        .annotate(total_amount=Sum("amount"))
+        .order_by("-total_amount")[:5]
+    )
+    return stats
+
+
+def get_dashboard_stats():
+    """Return the dashboard totals, from the cache when they are fresh."""
+    stats = cache.get(DASHBOARD_CACHE_KEY)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(DASHBOARD_CACHE_KEY, stats, DASHBOARD_CACHE_TIMEOUT)
+    return stats
+
+
+def forget_dashboard_stats():
+    cache.delete(DASHBOARD_CACHE_KEY)
@@ -0,0 +1,41 @@
+"""Memoised parsing of user agent strings into browser, OS and device."""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from user_agents import parse
+
+# Distinct user agent strings remembered per process.
+USER_AGENT_CACHE_SIZE = 1024
+# Longer strings are cut before parsing, so cache keys stay small.
+USER_AGENT_MAX_LENGTH = 512
+
+Device = namedtuple("Device", ["browser", "os", "device", "browser_family"])
+
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def parse_cached(user_agent_string):
+    user_agent = parse(user_agent_string)
+    return Device(
+        browser=f"{user_agent.browser.family} {user_agent.browser.version_string}",
+        os=user_agent.os.family,
+        device=(
+            user_agent.device.family
+            if user_agent.device.family != "Other"
+            else "Unknown Device"
+        ),
+        browser_family=user_agent.browser.family,
+    )
+
+
+def parse_user_agent(user_agent_string):
+    """
+    Return the browser (with version), OS and device of a user agent string.
+
+    Parsing runs a long list of regular expressions, so results are kept in
+    an LRU cache keyed by the raw string; traffic has few distinct ones.
+
+    Returns:
+        Device: (browser, os, device, browser_family)
+    """
+    return parse_cached((user_agent_string or "")[:USER_AGENT_MAX_LENGTH])
@@ -0,0 +1,143 @@
+"""Location of login IP addresses from a local database, with optional remote enrichment."""
+
+import ipaddress
+import logging
+import threading
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_LOCATION = "Unknown"
+
+
+def format_location(city=None, region=None, country=None):
+    return (
+        f"{city or UNKNOWN_LOCATION}, {region or UNKNOWN_LOCATION}, "
+        f"{country or UNKNOWN_LOCATION}"
+    )
+
+
+def network_of(ip_address):
+    """
+    Return the /24 (IPv4) or /48 (IPv6) network of an address, which share
+    a location closely enough to be cached together, or None when the
+    address is local or invalid.
+    """
+    try:
+        address = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return None
+    if not address.is_global:
+        return None
+    prefix = 24 if address.version == 4 else 48
+    return ipaddress.ip_network(f"{address}/{prefix}", strict=False)
+
+
+class NullBackend:
+    """Resolves every address to an unknown location."""
+
+    def locate(self, ip_address):
+        return "Localhost" if ip_address == "127.0.0.1" else UNKNOWN_LOCATION
+
+
+class MaxMindBackend(NullBackend):
+    """
+    Looks addresses up in a local MaxMind city database (.mmdb), opened
+    memory-mapped so lookups are served from the page cache and shared
+    between processes. Results are cached per network in an LRU cache.
+
+    Args:
+        path (str): Path of the database, GEOIP_DATABASE by default.
+        cache_size (int): Number of networks kept in the cache.
+    """
+
+    def __init__(self, path=None, cache_size=None):
+        self.path = path or settings.GEOIP_DATABASE
+        self.reader = None
+        self.lock = threading.Lock()
+        self.locate_network = lru_cache(
+            maxsize=cache_size or settings.GEOIP_CACHE_SIZE
+        )(self.locate_network)
+
+    def open(self):
+        with self.lock:
+            if self.reader is None:
+                import maxminddb
+
+                self.reader = maxminddb.open_database(self.path, maxminddb.MODE_MMAP)
+        return self.reader
+
+    def locate(self, ip_address):
+        network = network_of(ip_address)
+        if network is None or not self.path:
+            return super().locate(ip_address)
+        try:
+            return self.locate_network(network)
+        except Exception as e:
+            logger.error(f"Error locating {ip_address} in {self.path}: {e}")
+            return UNKNOWN_LOCATION
+
+    def locate_network(self, network):
+        record = self.open().get(network.network_address) or {}
+        subdivisions = record.get("subdivisions") or [{}]
+        return format_location(
+            city=record.get("city", {}).get("names", {}).get("en"),
+            region=subdivisions[0].get("names", {}).get("en"),
+            country=record.get("country", {}).get("iso_code"),
+        )
+
+
+def remote_location(ip_address):
+    """
+    Look an address up on ipinfo.io, for enrichment outside the request.
+
+    Returns None when the address is not public, the lookup fails, or
+    ipinfo.io knows nothing of it.
+    """
+    if network_of(ip_address) is None:
+        return None
+    try:
+        response = requests.get(
+            f"https://ipinfo.io/{ip_address}/json",
+            timeout=settings.GEOIP_REMOTE_TIMEOUT,
+        )
+        data = response.json()
+    except Exception as e:
+        logger.warning(f"Remote location lookup of {ip_address} failed: {e}")
+        return None
+    location = format_location(
+        data.get("city"), data.get("region"), data.get("country")
+    )
+    return None if location == format_location() else location
+
+
+def enrich_login_location(login_pk):
+    """Queue the remote lookup of a login whose location is unknown."""
+    from apps.accounts.tasks import enrich_login_location_task
+
+    try:
+        enrich_login_location_task.delay(login_pk)
+    except Exception as e:
+        logger.error(f"Error queueing location lookup of login {login_pk}: {e}")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_geolocation_backend():
+    """Return the GEOIP_BACKEND of this process, creating it once."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = import_string(settings.GEOIP_BACKEND)()
+        return _backend
+
+
+def get_location_from_ip(ip_address):
+    """Locate an address with the local backend, without any network call."""
+    return get_geolocation_backend().locate(ip_address)
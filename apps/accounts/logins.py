@@ -0,0 +1,194 @@
+"""Side effects of a successful login, run after the response is sent."""
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.html import strip_tags
+
+from apps.accounts.devices import USER_AGENT_MAX_LENGTH, parse_user_agent
+from apps.accounts.geolocation import (
+    UNKNOWN_LOCATION,
+    enrich_login_location,
+    get_location_from_ip,
+)
+from apps.accounts.models import LoginHistory
+from apps.accounts.notifications import (
+    is_new_device,
+    record_login,
+    remember_device,
+)
+from apps.core.utils import dispatch_email
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+# Seconds a user's latest login fingerprint stays cached.
+LOGIN_FINGERPRINT_TIMEOUT = 60 * 60 * 24
+
+
+def get_client_ip(request):
+    x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(",")[0]
+    else:
+        ip = request.META.get("REMOTE_ADDR")
+    return ip
+
+
+def login_event(request, user):
+    """
+    Capture what the login pipeline needs from the request, as a small
+    JSON-serialisable dict.
+    """
+    return {
+        "user_id": user.pk,
+        "ip_address": get_client_ip(request),
+        "user_agent": request.META.get("HTTP_USER_AGENT", "")[:USER_AGENT_MAX_LENGTH],
+        "login_time": timezone.now().isoformat(),
+        "site_name": get_current_site(request).name,
+    }
+
+
+def queue_login_event(event):
+    """Hand a login event to a Celery worker once the login commits."""
+    transaction.on_commit(lambda: dispatch_login_event(event))
+
+
+def dispatch_login_event(event):
+    from apps.accounts.tasks import process_login_task
+
+    try:
+        process_login_task.delay(event)
+    except Exception as e:
+        # Without a broker the login is still recorded, just in the request.
+        logger.error(f"Error queueing login of user {event['user_id']}: {e}")
+        process_login(event)
+
+
+def process_login(event):
+    """
+    Record a login event in the login history and alert the user.
+
+    The user agent is parsed and the address located locally. Repeated
+    logins from the same address and browser within a minute are skipped.
+    A login from a new device is alerted right away and any other login
+    goes into the user's digest. Unknown locations are looked up remotely
+    afterwards.
+
+    Args:
+        event (dict): A login event built by login_event.
+
+    Returns:
+        LoginHistory: The recorded login, or None when it was a repeat.
+    """
+    user = User.objects.filter(pk=event["user_id"]).first()
+    if user is None:
+        return None
+    login_time = parse_datetime(event["login_time"])
+    ip_address = event["ip_address"]
+    browser_info, os_info, device_info, browser_family = parse_user_agent(
+        event["user_agent"]
+    )
+    location = get_location_from_ip(ip_address)
+
+    # Check for duplicate login history
+    last_login = last_login_fingerprint(user.pk)
+    if last_login and (
+        (login_time - last_login[0]).total_seconds() <= 60
+        and last_login[1] == ip_address
+        and last_login[2] == browser_info
+    ):
+        return None
+
+    # Logins from known devices are gathered into a digest
+    new_device = is_new_device(user, browser_family, os_info, device_info)
+    login_record = record_login(
+        user,
+        new_device,
+        login_time=login_time,
+        ip_address=ip_address,
+        location=location,
+        browser=browser_info,
+        os=os_info,
+        device=device_info,
+    )
+    remember_login(login_record)
+    if new_device:
+        remember_device(user, browser_family, os_info, device_info)
+        send_login_alert(
+            user,
+            {
+                "user": user,
+                "login_time": login_time,
+                "ip_address": ip_address,
+                "location": location,
+                "device": device_info,
+                "browser": browser_info,
+                "os": os_info,
+                "site_name": event["site_name"],
+            },
+        )
+    if UNKNOWN_LOCATION in location and settings.GEOIP_REMOTE_LOOKUP:
+        enrich_login_location(login_record.pk)
+    return login_record
+
+
+def fingerprint_key(user_id):
+    return f"login-fingerprint:{user_id}"
+
+
+def last_login_fingerprint(user_id):
+    """
+    Return the (login time, IP address, browser) of a user's latest login.
+
+    It is read from the cache, or else from the (user, -login_time) index
+    of LoginHistory, so the duplicate check never scans a user's history.
+    """
+    fingerprint = cache.get(fingerprint_key(user_id))
+    if fingerprint is None:
+        fingerprint = (
+            LoginHistory.objects.filter(user_id=user_id)
+            .order_by("-login_time", "-id")
+            .values_list("login_time", "ip_address", "browser")
+            .first()
+        )
+        if fingerprint is not None:
+            cache.set(fingerprint_key(user_id), fingerprint, LOGIN_FINGERPRINT_TIMEOUT)
+    return fingerprint
+
+
+def remember_login(login):
+    """Make a newly recorded login the user's latest login fingerprint."""
+    cache.set(
+        fingerprint_key(login.user_id),
+        (login.login_time, login.ip_address, login.browser),
+        LOGIN_FINGERPRINT_TIMEOUT,
+    )
+
+
+def send_login_alert(user, context):
+    """Send the login notification email of a new device right away."""
+    subject = f"New Login Alert from {context['site_name']}"
+    html_message = render_to_string(
+        "registration/login_notification.html",
+        context,
+    )
+    text_message = strip_tags(html_message)
+
+    try:
+        dispatch_email(
+            subject,
+            text_message,
+            html_message,
+            user.email,
+            user.get_full_name(),
+        )
+    except Exception as e:
+        logger.exception(f"Login email notification failed: {e}")
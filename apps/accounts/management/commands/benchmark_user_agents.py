@@ -0,0 +1,80 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from ua_parser import user_agent_parser
+from user_agents import parse
+
+from apps.accounts.devices import parse_cached, parse_user_agent
+
+# User agents of common browsers, operating systems and devices.
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:133.0) Gecko/20100101 Firefox/133.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 18_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/131.0.6778.73 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (iPad; CPU OS 17_7 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.7 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android 14; SM-A155F) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.81 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 13; TECNO KI5q) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.6723.107 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 12; Infinix X6816) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.6668.100 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.6778.81 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 11; itel A571W) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.230 Mobile Safari/537.36 OPR/86.0.2254.74831",
+    "Mozilla/5.0 (Linux; U; Android 10; en-US; SM-A105F) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/78.0.3904.108 UCBrowser/13.4.0.1306 Mobile Safari/537.36",
+    "Opera/9.80 (J2ME/MIDP; Opera Mini/9.80 (S60; SymbOS; Opera Mobi/23.348; U; en) Presto/2.5.25 Version/10.54",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare parsing the user agent of every login with user_agents.parse "
+        "against the cached parse_user_agent, cold and warm."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--logins",
+            type=int,
+            default=10000,
+            help="Number of logins parsed, drawn from the user agent corpus.",
+        )
+
+    def handle(self, *args, **options):
+        logins = random.Random(0).choices(USER_AGENTS, k=options["logins"])
+
+        # ua-parser keeps a small cache of its own, emptied here so the cold
+        # numbers include the regular expressions.
+        parse_cache = getattr(user_agent_parser, "_PARSE_CACHE", {})
+        started = time.perf_counter()
+        for user_agent in USER_AGENTS:
+            parse_cache.clear()
+            parse(user_agent)
+        self.report("user_agents.parse, cold", started, len(USER_AGENTS))
+
+        started = time.perf_counter()
+        for user_agent in logins:
+            parse(user_agent)
+        self.report("user_agents.parse per login", started, len(logins))
+
+        parse_cached.cache_clear()
+        parse_cache.clear()
+        started = time.perf_counter()
+        for user_agent in USER_AGENTS:
+            parse_user_agent(user_agent)
+        self.report("parse_user_agent, cold", started, len(USER_AGENTS))
+
+        started = time.perf_counter()
+        for user_agent in logins:
+            parse_user_agent(user_agent)
+        self.report("parse_user_agent, warm", started, len(logins))
+        self.stdout.write(f"Cache: {parse_cached.cache_info()}")
+
+    def report(self, label, started, parses):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label}: {parses} parses in {elapsed * 1000:.1f}ms "
+            f"({elapsed / parses * 1e6:.1f}µs each)"
+        )
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.retention import PRUNE_BATCH_SIZE, prune_login_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll login history older than LOGIN_HISTORY_RETENTION_DAYS up into "
+        "per-user, per-day LoginHistoryRollup rows and delete it in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.LOGIN_HISTORY_RETENTION_DAYS,
+            help="Number of days of login history kept in the database.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PRUNE_BATCH_SIZE,
+            help="Number of logins rolled up and deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        pruned = prune_login_history(
+            retention_days=options["retention_days"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} logins."))
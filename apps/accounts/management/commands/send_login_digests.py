@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.notifications import send_login_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue the login digests whose window has passed. Digests are "
+        "normally scheduled on login; this catches any a lost task missed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Also send digests whose window has not passed yet.",
+        )
+
+    def handle(self, *args, **options):
+        sent = send_login_digests(due_only=not options["all"])
+        self.stdout.write(self.style.SUCCESS(f"{sent} login digests queued."))
@@ -1,5 +1,33 @@
 from django.urls import reverse
 from django.shortcuts import redirect
+from django.utils.functional import cached_property
+
+ONBOARDED_SESSION_KEY = "bettor_onboarded"
+
+
+def is_onboarded(request):
+    """
+    Whether the logged-in bettor has set a transaction PIN and payout
+    information.
+
+    A positive answer is stored in the session, which every worker shares,
+    so onboarded bettors are not checked again until they save their
+    profile. Users without a profile are not held back.
+    """
+    if request.session.get(ONBOARDED_SESSION_KEY):
+        return True
+    profile = getattr(request.user, "profile", None)
+    onboarded = not profile or bool(
+        profile.transaction_pin and profile.payout_information
+    )
+    if onboarded:
+        request.session[ONBOARDED_SESSION_KEY] = True
+    return onboarded
+
+
+def forget_onboarded(request):
+    """Check the bettor's profile again on the next request."""
+    request.session.pop(ONBOARDED_SESSION_KEY, None)
 
 
 class BettorOnboardingMiddleware:
@@ -8,23 +36,26 @@ class BettorOnboardingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
+    @cached_property
+    def allowed_paths(self):
+        # Resolved once, on the first request, when the URLconf is loaded.
+        return frozenset(
+            [
+                reverse("bettor:onboarding_form"),
+                reverse("auth:logout"),
+            ]
+        )
+
     def __call__(self, request):
-        if request.user.is_authenticated:
-            profile = getattr(request.user, "profile", None)
-
-            # Consider bettors as non-staff/non-superuser with a Profile
-            if (
-                profile
-                and not request.user.is_staff
-                and not request.user.is_superuser
-                and not (profile.transaction_pin and profile.payout_information)
-            ):
-                allowed_paths = [
-                    reverse("bettor:onboarding_form"),
-                    reverse("auth:logout"),
-                ]
-                if request.path not in allowed_paths:
-                    return redirect("bettor:onboarding_form")
+        # Consider bettors as non-staff/non-superuser with a Profile
+        if (
+            request.user.is_authenticated
+            and not request.user.is_staff
+            and not request.user.is_superuser
+            and request.path not in self.allowed_paths
+            and not is_onboarded(request)
+        ):
+            return redirect("bettor:onboarding_form")
 
         response = self.get_response(request)
         return response
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_remove_ticket_user_delete_reply_delete_ticket"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="loginhistory",
+            name="digest_pending",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether the login still has to be reported in a login digest.",
+                verbose_name="digest pending?",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loginhistory",
+            index=models.Index(
+                condition=models.Q(("digest_pending", True)),
+                fields=["user", "login_time"],
+                name="login_digest_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_loginhistory_digest_pending"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="loginhistory",
+            name="login_time",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0006_alter_loginhistory_login_time"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="loginhistory",
+            index=models.Index(
+                fields=["user", "-login_time", "-id"], name="loginhistory_user_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loginhistory",
+            index=models.Index(
+                fields=["-login_time", "-id"], name="loginhistory_time_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_loginhistory_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoginHistoryRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="date")),
+                (
+                    "logins",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of logins during the day.",
+                        verbose_name="logins",
+                    ),
+                ),
+                (
+                    "ip_addresses",
+                    models.JSONField(
+                        default=list,
+                        help_text="Distinct IP addresses the user logged in from.",
+                        verbose_name="IP addresses",
+                    ),
+                ),
+                (
+                    "devices",
+                    models.JSONField(
+                        default=list,
+                        help_text="Distinct browser, operating system and device combinations.",
+                        verbose_name="devices",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="login_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Login History Rollup",
+                "verbose_name_plural": "Login History Rollups",
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "date"), name="unique_login_rollup_per_day"
+                    )
+                ],
+            },
+        ),
+    ]
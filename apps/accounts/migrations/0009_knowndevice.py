@@ -0,0 +1,63 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_loginhistoryrollup"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="KnownDevice",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "browser_family",
+                    models.CharField(
+                        help_text="Browser without its version, so updates are not new devices.",
+                        max_length=50,
+                        verbose_name="browser family",
+                    ),
+                ),
+                (
+                    "os",
+                    models.CharField(max_length=50, verbose_name="operating system"),
+                ),
+                ("device", models.CharField(max_length=50, verbose_name="device")),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="known_devices",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Known Device",
+                "verbose_name_plural": "Known Devices",
+                "ordering": ["-created"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "browser_family", "os", "device"),
+                        name="unique_known_device_per_user",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Fills KnownDevice from the logins still in LoginHistory and from the
+# devices kept by LoginHistoryRollup, so existing users are not alerted of
+# a new device on their next login.
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def browser_family(browser):
+    """Strip the version recorded after the browser family, if any."""
+    family, _, version = (browser or "").rpartition(" ")
+    if family and (not version or version[0].isdigit()):
+        return family
+    return (browser or "").strip()
+
+
+def backfill_known_devices(apps, schema_editor):
+    KnownDevice = apps.get_model("accounts", "KnownDevice")
+    LoginHistory = apps.get_model("accounts", "LoginHistory")
+    LoginHistoryRollup = apps.get_model("accounts", "LoginHistoryRollup")
+
+    devices = set()
+    logins = (
+        LoginHistory.objects.order_by()
+        .values_list("user_id", "browser", "os", "device")
+        .distinct()
+    )
+    for user_id, browser, os, device in logins.iterator():
+        devices.add((user_id, browser_family(browser), os or "", device or ""))
+    for user_id, rollup_devices in LoginHistoryRollup.objects.values_list(
+        "user_id", "devices"
+    ).iterator():
+        for rollup_device in rollup_devices:
+            browser, _, rest = rollup_device.partition(" / ")
+            os, _, device = rest.partition(" / ")
+            devices.add((user_id, browser_family(browser), os, device))
+
+    KnownDevice.objects.bulk_create(
+        [
+            KnownDevice(user_id=user_id, browser_family=family, os=os, device=device)
+            for user_id, family, os, device in devices
+        ],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0009_knowndevice"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_known_devices, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,15 @@
-from apps.accounts.models.auth import Profile, LoginHistory
+from apps.accounts.models.auth import (
+    KnownDevice,
+    Profile,
+    LoginHistory,
+    LoginHistoryRollup,
+)
 from apps.accounts.models.activities import Action
 
 __all__ = [
     "Action",
+    "KnownDevice",
     "Profile",
     "LoginHistory",
+    "LoginHistoryRollup",
 ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -56,15 +57,118 @@ class LoginHistory(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
-    login_time = models.DateTimeField(auto_now_add=True)
+    login_time = models.DateTimeField(default=timezone.now)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     browser = models.CharField(max_length=50, null=True, blank=True)
     location = models.CharField(max_length=100, null=True, blank=True)
     os = models.CharField(max_length=50, null=True, blank=True)
     device = models.CharField(max_length=50, null=True, blank=True)
+    digest_pending = models.BooleanField(
+        _("digest pending?"),
+        default=False,
+        help_text=_("Whether the login still has to be reported in a login digest."),
+    )
 
     class Meta:
         ordering = ["-login_time"]
+        indexes = [
+            models.Index(
+                fields=["user", "-login_time", "-id"],
+                name="loginhistory_user_time_idx",
+            ),
+            models.Index(fields=["-login_time", "-id"], name="loginhistory_time_idx"),
+            models.Index(
+                fields=["user", "login_time"],
+                condition=models.Q(digest_pending=True),
+                name="login_digest_pending_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.login_time}"
+
+
+class LoginHistoryRollup(models.Model):
+    """
+    Keeps one user's logins of a day after the raw LoginHistory rows are
+    pruned: how many there were and from which addresses and devices.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="login_rollups",
+        verbose_name=_("user"),
+    )
+    date = models.DateField(_("date"))
+    logins = models.PositiveIntegerField(
+        _("logins"),
+        default=0,
+        help_text=_("Number of logins during the day."),
+    )
+    ip_addresses = models.JSONField(
+        _("IP addresses"),
+        default=list,
+        help_text=_("Distinct IP addresses the user logged in from."),
+    )
+    devices = models.JSONField(
+        _("devices"),
+        default=list,
+        help_text=_("Distinct browser, operating system and device combinations."),
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name = _("Login History Rollup")
+        verbose_name_plural = _("Login History Rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"],
+                name="unique_login_rollup_per_day",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date}"
+
+
+class KnownDevice(models.Model):
+    """
+    A browser, operating system and device a user has logged in from.
+
+    Unlike LoginHistory rows, known devices are never pruned, so a device
+    seen long ago does not raise a new device alert again.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="known_devices",
+        verbose_name=_("user"),
+    )
+    browser_family = models.CharField(
+        _("browser family"),
+        max_length=50,
+        help_text=_("Browser without its version, so updates are not new devices."),
+    )
+    os = models.CharField(_("operating system"), max_length=50)
+    device = models.CharField(_("device"), max_length=50)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created"]
+        verbose_name = _("Known Device")
+        verbose_name_plural = _("Known Devices")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "browser_family", "os", "device"],
+                name="unique_known_device_per_user",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.user.username} - {self.browser_family} / {self.os} / {self.device}"
+        )
@@ -0,0 +1,151 @@
+"""Login alerts, sent right away for new devices and as digests otherwise."""
+
+import logging
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from apps.accounts.models import KnownDevice, LoginHistory
+from apps.core.utils import queue_emails
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+DIGEST_CHUNK_SIZE = 200
+
+
+def login_digest_window():
+    return timedelta(minutes=settings.LOGIN_DIGEST_WINDOW)
+
+
+def is_new_device(user, browser_family, os_info, device_info):
+    """
+    Whether the user has never logged in from this browser, operating system
+    and device before. Browser updates do not count as a new device.
+    """
+    return not KnownDevice.objects.filter(
+        user=user,
+        browser_family=browser_family,
+        os=os_info,
+        device=device_info,
+    ).exists()
+
+
+def remember_device(user, browser_family, os_info, device_info):
+    """Add a device to the user's known devices, once."""
+    KnownDevice.objects.get_or_create(
+        user=user,
+        browser_family=browser_family,
+        os=os_info,
+        device=device_info,
+    )
+
+
+def record_login(user, new_device, **details):
+    """
+    Record a login. The caller alerts the user of a login from a new device
+    right away; any other login is left pending for the user's next digest.
+
+    The first pending login of a user schedules the digest at the end of
+    the window, so the next logins cost a single insert.
+
+    Args:
+        user (User): The user who logged in.
+        new_device (bool): Whether the device was never seen before.
+        **details: LoginHistory fields of the login.
+
+    Returns:
+        LoginHistory: The recorded login.
+    """
+    first_pending = (
+        not new_device
+        and not LoginHistory.objects.filter(user=user, digest_pending=True).exists()
+    )
+    login = LoginHistory.objects.create(
+        user=user, digest_pending=not new_device, **details
+    )
+    if first_pending:
+        transaction.on_commit(lambda: schedule_login_digest(user.pk))
+    return login
+
+
+def schedule_login_digest(user_pk):
+    from apps.accounts.tasks import send_login_digest_task
+
+    try:
+        send_login_digest_task.apply_async(
+            args=[user_pk],
+            countdown=login_digest_window().total_seconds(),
+        )
+    except Exception as e:
+        # The digest goes out with the next send_login_digests run.
+        logger.error(f"Error scheduling login digest for user {user_pk}: {e}")
+
+
+def send_login_digests(user_ids=None, due_only=True):
+    """
+    Queue one digest email per user covering all their pending logins.
+
+    Args:
+        user_ids (list): Limit the digests to these users.
+        due_only (bool): Only include users whose first pending login is
+            older than LOGIN_DIGEST_WINDOW.
+
+    Returns:
+        int: Number of digests queued.
+    """
+    pending = LoginHistory.objects.filter(digest_pending=True)
+    if user_ids is not None:
+        pending = pending.filter(user_id__in=user_ids)
+    users = pending.order_by().values("user_id").annotate(first=Min("login_time"))
+    if due_only:
+        users = users.filter(first__lte=timezone.now() - login_digest_window())
+    user_ids = [row["user_id"] for row in users]
+
+    site_name = Site.objects.get_current().name
+    sent = 0
+    for start in range(0, len(user_ids), DIGEST_CHUNK_SIZE):
+        chunk = user_ids[start : start + DIGEST_CHUNK_SIZE]
+        with transaction.atomic():
+            logins = list(
+                LoginHistory.objects.select_for_update()
+                .filter(user_id__in=chunk, digest_pending=True)
+                .order_by("user_id", "login_time")
+            )
+            recipients = User.objects.in_bulk({login.user_id for login in logins})
+            emails = []
+            for user_id, user_logins in groupby(logins, key=lambda x: x.user_id):
+                emails.append(
+                    login_digest_email(
+                        recipients[user_id], list(user_logins), site_name
+                    )
+                )
+            queue_emails(emails)
+            LoginHistory.objects.filter(pk__in=[login.pk for login in logins]).update(
+                digest_pending=False
+            )
+        sent += len(emails)
+    return sent
+
+
+def login_digest_email(user, logins, site_name):
+    """Return the digest email of a user's logins as EmailOutbox field values."""
+    html_message = render_to_string(
+        "registration/login_digest.html",
+        {"user": user, "logins": logins, "site_name": site_name},
+    )
+    return {
+        "subject": f"Your recent logins on {site_name}",
+        "text_content": strip_tags(html_message),
+        "html_content": html_message,
+        "recipient_email": user.email,
+        "recipient_name": user.get_full_name(),
+    }
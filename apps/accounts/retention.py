@@ -0,0 +1,109 @@
+"""Retention of login history: old logins are rolled up per user and day."""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import LoginHistory, LoginHistoryRollup
+
+logger = logging.getLogger(__name__)
+
+PRUNE_BATCH_SIZE = 5000
+
+
+def device_of(login):
+    return " / ".join(
+        value or "Unknown" for value in (login.browser, login.os, login.device)
+    )
+
+
+def rollup_batch(logins):
+    """
+    Add a batch of logins to the rollups of their users and days.
+
+    Rollups already holding part of a day, from an earlier batch or run,
+    are extended rather than replaced.
+    """
+    totals = {}
+    for login in logins:
+        key = (login.user_id, timezone.localtime(login.login_time).date())
+        total = totals.setdefault(key, [0, set(), set()])
+        total[0] += 1
+        if login.ip_address:
+            total[1].add(login.ip_address)
+        total[2].add(device_of(login))
+
+    existing = {
+        (rollup.user_id, rollup.date): rollup
+        for rollup in LoginHistoryRollup.objects.select_for_update().filter(
+            user_id__in={user_id for user_id, _ in totals},
+            date__in={date for _, date in totals},
+        )
+    }
+    created, updated = [], []
+    for (user_id, date), (logins_count, ip_addresses, devices) in totals.items():
+        rollup = existing.get((user_id, date))
+        if rollup is None:
+            created.append(
+                LoginHistoryRollup(
+                    user_id=user_id,
+                    date=date,
+                    logins=logins_count,
+                    ip_addresses=sorted(ip_addresses),
+                    devices=sorted(devices),
+                )
+            )
+        else:
+            rollup.logins += logins_count
+            rollup.ip_addresses = sorted(ip_addresses.union(rollup.ip_addresses))
+            rollup.devices = sorted(devices.union(rollup.devices))
+            rollup.updated = timezone.now()
+            updated.append(rollup)
+
+    LoginHistoryRollup.objects.bulk_create(created)
+    LoginHistoryRollup.objects.bulk_update(
+        updated, ["logins", "ip_addresses", "devices", "updated"]
+    )
+
+
+def prune_login_history(retention_days=None, batch_size=PRUNE_BATCH_SIZE):
+    """
+    Roll up and delete the logins older than the retention period.
+
+    Each batch of the oldest logins is added to LoginHistoryRollup and
+    deleted in one short transaction, so the table is never locked for
+    long and a run that stops part way can simply be repeated. Logins still
+    waiting for a digest are kept.
+
+    Args:
+        retention_days (int): Age in days past which logins are pruned.
+        batch_size (int): Number of logins per transaction.
+
+    Returns:
+        int: Number of logins pruned.
+    """
+    if retention_days is None:
+        retention_days = settings.LOGIN_HISTORY_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    expired = LoginHistory.objects.filter(
+        login_time__lt=cutoff, digest_pending=False
+    ).order_by("login_time", "id")
+
+    pruned = 0
+    while True:
+        with transaction.atomic():
+            logins = list(
+                expired.select_for_update(skip_locked=True).only(
+                    "user_id", "login_time", "ip_address", "browser", "os", "device"
+                )[:batch_size]
+            )
+            if not logins:
+                break
+            rollup_batch(logins)
+            LoginHistory.objects.filter(pk__in=[login.pk for login in logins]).delete()
+        pruned += len(logins)
+        logger.info(f"Pruned {pruned} logins older than {cutoff:%Y-%m-%d}.")
+    return pruned
@@ -1,7 +1,10 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from apps.accounts.dashboard import forget_dashboard_stats
 from apps.accounts.models.auth import Profile
+from apps.groups.models import Bundle, Group, Payout, Purchase
+from apps.tickets.models import Ticket
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -13,3 +16,27 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def save_user_profile(sender, instance, **kwargs):
     instance.profile.save()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Bundle)
+@receiver(post_delete, sender=Bundle)
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=Purchase)
+@receiver(post_delete, sender=Purchase)
+@receiver(post_save, sender=Payout)
+@receiver(post_delete, sender=Payout)
+def forget_admin_dashboard(sender, **kwargs):
+    # Bulk updates send no signal; the cache timeout covers those.
+    forget_dashboard_stats()
+
+
+@receiver(post_save, sender=Profile)
+def forget_admin_dashboard_new_user(sender, created, **kwargs):
+    # Profiles are saved with their user on every login, so only a new
+    # user clears the totals; confirmed e-mails show once the cache expires.
+    if created:
+        forget_dashboard_stats()
@@ -0,0 +1,35 @@
+"""Celery tasks of the accounts app."""
+
+from celery import shared_task
+
+from apps.accounts.geolocation import remote_location
+from apps.accounts.logins import process_login
+from apps.accounts.models import LoginHistory
+from apps.accounts.notifications import send_login_digests
+
+
+@shared_task
+def process_login_task(event):
+    """Record a login event and send its alert."""
+    login = process_login(event)
+    return login.pk if login else None
+
+
+@shared_task
+def send_login_digest_task(user_pk):
+    """Send the login digest of a user once their window has passed."""
+    return send_login_digests(user_ids=[user_pk], due_only=False)
+
+
+@shared_task
+def enrich_login_location_task(login_pk):
+    """Fill in the location of a login from ipinfo.io."""
+    login = LoginHistory.objects.filter(pk=login_pk).only("ip_address").first()
+    if login is None:
+        return None
+    location = remote_location(login.ip_address)
+    if location is not None:
+        LoginHistory.objects.filter(pk=login_pk).exclude(location=location).update(
+            location=location
+        )
+    return location
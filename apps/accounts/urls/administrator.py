@@ -22,6 +22,8 @@ from apps.accounts.views import (
     admin_withdrawals_pending,
     admin_withdrawals_cancelled,
     admin_process_withdrawal,
+    admin_export,
+    admin_email_dispatch_stats,
 )
 
 app_name = "administrator"
@@ -38,6 +40,12 @@ urlpatterns = [
         name="transaction_history",
     ),
     path("dashboard/", admin_dashboard, name="dashboard"),
+    path("exports/<str:dataset>/", admin_export, name="export"),
+    path(
+        "email-dispatch/stats/",
+        admin_email_dispatch_stats,
+        name="email_dispatch_stats",
+    ),
     # Withdrawals
     path(
         "withdrawals/",
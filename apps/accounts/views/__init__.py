@@ -20,6 +20,8 @@ from apps.accounts.views.administrator import (
     admin_withdrawals_pending,
     admin_withdrawals_cancelled,
     admin_process_withdrawal,
+    admin_export,
+    admin_email_dispatch_stats,
 )
 from apps.accounts.views.bettor import (
     onboarding_form,
@@ -51,6 +53,8 @@ __all__ = [
     "admin_withdrawals_pending",
     "admin_withdrawals_cancelled",
     "admin_process_withdrawal",
+    "admin_export",
+    "admin_email_dispatch_stats",
     # Bettor
     "onboarding_form",
     "update_transaction_pin",
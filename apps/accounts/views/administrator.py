@@ -1,13 +1,18 @@
-from decimal import Decimal
 import logging
 
+from django.http import (
+    Http404,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.template.loader import render_to_string
 from django.contrib.sites.shortcuts import get_current_site
 from django.utils.html import strip_tags
-from django.db import models, transaction
+from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.views.decorators.http import require_POST
 from django.utils.timezone import now
@@ -17,10 +22,18 @@ from apps.accounts.models import (
     Action,
     LoginHistory,
 )
-from apps.tickets.models import Ticket
-from apps.core.utils import mk_paginator, create_action, send_email_thread
-from apps.wallets.models import Withdrawal, Deposit
-from apps.groups.models import Group, Bundle, Purchase, Payout
+from apps.accounts.dashboard import get_dashboard_stats
+from apps.core.dispatch import get_dispatcher
+from apps.core.exports import EXPORT_FORMATS, EXPORTS, stream_export
+from apps.core.forms import ExportForm
+from apps.core.utils import (
+    mk_paginator,
+    keyset_paginate,
+    create_action,
+    queue_email,
+)
+from apps.wallets.models import AuditLog, Withdrawal, Deposit
+from apps.groups.models import Group, Purchase, Payout
 
 logger = logging.getLogger(__name__)
 
@@ -38,32 +51,11 @@ def is_admin(user):
 @login_required
 @user_passes_test(is_admin)
 def admin_dashboard(request):
-    groups = Group.objects.all()
-    total_groups = groups.count()
-    running_groups = groups.filter(status=Group.Status.RUNNING).count()
-
-    bundles = Bundle.objects.all()
-    total_bundles = bundles.count()
-    pending_bundles = bundles.filter(status=Bundle.Status.PENDING).count()
-
-    tickets = Ticket.objects.all()
-    total_tickets = tickets.count()
-    pending_tickets = tickets.filter(status=Ticket.Status.PENDING).count()
-
-    bettors = Profile.objects.filter(user__is_staff=False)
-    total_users = bettors.count()
-    active_users = bettors.filter(email_confirmed=True).count()
+    # Totals are cached for a short while and cleared by saves
+    stats = get_dashboard_stats()
 
     activities = Action.objects.exclude(user=request.user)[:5]
 
-    # Get the top 5 bundles based on staked amount
-    top_bundles = (
-        Purchase.objects.filter(status=Purchase.Status.APPROVED)
-        .values("bundle__name", "bundle__group__name")
-        .annotate(total_amount=models.Sum("amount"))
-        .order_by("-total_amount")[:5]
-    )
-
     # Get the latest 5 bundle purchases
     latest_purchases = (
         Purchase.objects.filter(status=Purchase.Status.APPROVED)
@@ -80,32 +72,12 @@ def admin_dashboard(request):
         .order_by("-updated")[:5]
     )
 
-    # Calculate the total stakes
-    total_purchases = Purchase.objects.filter(
-        status=Purchase.Status.APPROVED
-    ).aggregate(total=models.Sum("amount")).get("total") or Decimal("0.00")
-
-    # Calculate the total payouts
-    total_payouts = Payout.objects.filter(status=Payout.Status.APPROVED).aggregate(
-        total=models.Sum("amount")
-    ).get("total") or Decimal("0.00")
-
     template = "accounts/administrator/dashboard.html"
     context = {
-        "total_groups": total_groups,
-        "running_groups": running_groups,
-        "total_bundles": total_bundles,
-        "pending_bundles": pending_bundles,
-        "total_tickets": total_tickets,
-        "pending_tickets": pending_tickets,
-        "total_users": total_users,
-        "active_users": active_users,
+        **stats,
         "activities": activities,
-        "top_bundles": top_bundles,
         "latest_purchases": latest_purchases,
-        "total_purchases": total_purchases,
         "latest_payouts": latest_payouts,
-        "total_payouts": total_payouts,
     }
 
     return render(request, template, context)
@@ -121,11 +93,18 @@ def admin_users_login_history(request):
             user__is_staff=False
         )
 
-    login_records = mk_paginator(request, login_records, PAGINATION_COUNT)
+    user_id = request.GET.get("user", "")
+    if user_id.isdigit():
+        login_records = login_records.filter(user_id=user_id)
+
+    login_records, next_cursor = keyset_paginate(
+        request, login_records, PAGINATION_COUNT, "login_time"
+    )
 
     template = "accounts/administrator/login_history.html"
     context = {
         "login_records": login_records,
+        "next_cursor": next_cursor,
     }
 
     return render(request, template, context)
@@ -370,7 +349,7 @@ def admin_users_assign_group(request, username):
                 )
 
                 # Send email asynchronously
-                send_email_thread(
+                queue_email(
                     subject,
                     text_message,
                     html_message,
@@ -427,7 +406,7 @@ def admin_suspend_user(request, username):
         {"user": profile.user},
     )
     text_message = strip_tags(html_message)
-    send_email_thread(
+    queue_email(
         subject,
         text_message,
         html_message,
@@ -467,7 +446,7 @@ def admin_unban_user(request, username):
         {"user": profile.user},
     )
     text_message = strip_tags(html_message)
-    send_email_thread(
+    queue_email(
         subject,
         text_message,
         html_message,
@@ -578,7 +557,7 @@ def send_withdrawal_email(request, withdrawal, status):
     else:
         return  # Invalid status, do not send email
 
-    send_email_thread(
+    queue_email(
         subject=subject,
         text_content=text_message,
         html_content=html_message,
@@ -616,11 +595,14 @@ def admin_process_withdrawal(request, withdrawal_id):
                 withdrawal.processed_at = now()
 
                 # Deduct wallet balance
-                wallet = withdrawal.wallet
-                if wallet.balance < withdrawal.amount:
+                try:
+                    withdrawal.wallet.debit(
+                        withdrawal.amount,
+                        transaction_type=AuditLog.TransactionType.WALLET_WITHDRAWAL,
+                        transaction_id=withdrawal.reference,
+                    )
+                except ValueError:
                     raise ValueError("Insufficient wallet balance for approval.")
-                wallet.balance -= withdrawal.amount
-                wallet.save()
 
                 messages.success(request, "Withdrawal approved successfully.")
                 send_withdrawal_email(request, withdrawal, "approved")
@@ -765,3 +747,43 @@ def admin_payouts_cancelled(request):
     }
 
     return render(request, template, context)
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_export(request, dataset):
+    """
+    Stream an export of audit logs, deposits, withdrawals, purchases or
+    payouts as CSV or JSONL, filtered by date range and status.
+    """
+    if dataset not in EXPORTS:
+        raise Http404("Unknown export.")
+
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+
+    export_format = form.cleaned_data["format"]
+    response = StreamingHttpResponse(
+        stream_export(
+            dataset,
+            export_format,
+            start=form.cleaned_data["start"],
+            end=form.cleaned_data["end"],
+            status=form.cleaned_data["status"],
+        ),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    filename = f"{dataset}-{now():%Y%m%d}.{export_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_email_dispatch_stats(request):
+    """
+    Return the queue depth, send latency and failure counters of this
+    process's email dispatch pool.
+    """
+    return JsonResponse(get_dispatcher().stats())
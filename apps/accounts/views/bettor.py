@@ -5,7 +5,8 @@ from django.shortcuts import render, redirect
 from django.db import transaction
 from django.contrib import messages
 from django.contrib.auth import logout
-from django.db.models import Sum
+from django.db.models import Count, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.hashers import make_password, check_password
 
 from apps.accounts.forms import (
@@ -14,11 +15,13 @@ from apps.accounts.forms import (
     OnboardingForm,
     UpdateTransactionPINForm,
 )
+from apps.accounts.middleware import forget_onboarded
 from apps.accounts.models import Action
 from apps.tickets.models import Ticket
 from apps.groups.models import Bundle, Group, Purchase, Payout
 from apps.core.utils import create_action, mk_paginator
 from apps.wallets.models import Withdrawal
+from apps.wallets.utils import get_user_wallet
 import logging
 
 logger = logging.getLogger(__name__)
@@ -95,6 +98,7 @@ def update_transaction_pin(request):
                 # Update the transaction PIN
                 profile.transaction_pin = make_password(new_pin)
                 profile.save()
+                forget_onboarded(request)
                 messages.success(
                     request, "Your transaction PIN has been updated successfully."
                 )
@@ -150,7 +154,7 @@ def bettor_dashboard(request):
         "total_tickets": total_tickets,
         "total_purchases": total_purchases,
         "total_payouts": total_payouts,
-        "wallet_balance": request.user.wallet.balance,
+        "wallet_balance": get_user_wallet(request).balance,
         "bettor": request.user,
         "total_pending_withdrawals": total_pending_withdrawals,
         "pending_bundles": pending_bundles,
@@ -171,6 +175,7 @@ def bettor_settings(request):
         if user_form.is_valid() and profile_form.is_valid():
             user_form.save()
             profile_form.save()
+            forget_onboarded(request)
 
             messages.success(
                 request,
@@ -224,19 +229,27 @@ def bettor_deactivate(request):
 
 @login_required
 def bettor_payouts_all(request):
-    # Get all payouts for the user
-    payouts = Payout.objects.filter(user=request.user).select_related("bundle")
-
-    # Attach purchase_amount to each payout by summing user's purchases for the payout's bundle
-    for payout in payouts:
-        purchases = Purchase.objects.filter(user=request.user, bundle=payout.bundle)
-        payout.purchase_amount = (
-            purchases.aggregate(total_amount=Sum("amount"))["total_amount"] or 0
+    # Sum of the user's purchases of each payout's bundle, per row
+    purchase_amount = (
+        Purchase.objects.filter(user=OuterRef("user"), bundle=OuterRef("bundle"))
+        .order_by()
+        .values("user", "bundle")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    payouts = (
+        Payout.objects.filter(user=request.user)
+        .select_related("bundle")
+        .annotate(
+            purchase_amount=Coalesce(Subquery(purchase_amount), Value(Decimal("0.00")))
         )
+    )
 
-    # Calculate statistics
-    total_payouts = payouts.count()
-    approved_payouts = payouts.filter(status=Payout.Status.APPROVED).count()
+    # Calculate statistics in one query
+    stats = Payout.objects.filter(user=request.user).aggregate(
+        total_payouts=Count("id"),
+        approved_payouts=Count("id", filter=Q(status=Payout.Status.APPROVED)),
+    )
 
     # Paginate payouts
     payouts = mk_paginator(request, payouts, PAGINATION_COUNT)
@@ -244,8 +257,8 @@ def bettor_payouts_all(request):
     template = "accounts/bettor/payouts/all.html"
     context = {
         "payouts": payouts,
-        "total_payouts": total_payouts,
-        "approved_payouts": approved_payouts,
+        "total_payouts": stats["total_payouts"],
+        "approved_payouts": stats["approved_payouts"],
     }
 
     return render(request, template, context)
@@ -1 +1,17 @@
-# Register your models here.
+from django.contrib import admin
+
+from .models import EmailOutbox
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "recipient_email",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("recipient_email", "subject", "provider_message_id")
@@ -0,0 +1,167 @@
+"""Immediate email sending on a bounded, process-wide pool of threads."""
+
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+SPILL = "spill"
+BLOCK = "block"
+WHEN_FULL_CHOICES = (SPILL, BLOCK)
+
+
+class EmailDispatcher:
+    """
+    Sends emails through Mailjet on a fixed number of worker threads fed by
+    a bounded queue, so a burst of emails never starts more threads or
+    holds more messages in memory than configured.
+
+    When the queue is full the email is written to the outbox instead
+    (EMAIL_DISPATCH_WHEN_FULL = "spill"), or the caller waits for room for
+    up to EMAIL_DISPATCH_BLOCK_TIMEOUT seconds and spills after that
+    ("block").
+
+    Args:
+        workers (int): Number of worker threads.
+        queue_size (int): Number of emails that may wait for a worker.
+        when_full (str): "spill" or "block".
+        block_timeout (float): Seconds a caller waits when blocking.
+
+    Raises:
+        ImproperlyConfigured: If when_full is not "spill" or "block".
+    """
+
+    def __init__(self, workers, queue_size, when_full=SPILL, block_timeout=10):
+        if when_full not in WHEN_FULL_CHOICES:
+            raise ImproperlyConfigured(
+                f"EMAIL_DISPATCH_WHEN_FULL must be one of "
+                f"{', '.join(WHEN_FULL_CHOICES)}, not {when_full!r}."
+            )
+        self.workers = workers
+        self.queue_size = queue_size
+        self.when_full = when_full
+        self.block_timeout = block_timeout
+        self.lock = threading.Lock()
+        self.pid = None
+        self.queue = None
+        self.counters = dict.fromkeys(
+            ["submitted", "sent", "failed", "spilled", "blocked"], 0
+        )
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        """Start the workers, again in a forked child whose threads are gone."""
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.queue = queue.Queue(maxsize=self.queue_size)
+            for number in range(self.workers):
+                threading.Thread(
+                    target=self.work,
+                    args=(self.queue,),
+                    name=f"email-dispatch-{number}",
+                    daemon=True,
+                ).start()
+            self.pid = os.getpid()
+
+    def submit(self, email):
+        """
+        Hand an email to the workers.
+
+        Args:
+            email (dict): Arguments of send_email_via_mailjet.
+
+        Returns:
+            bool: False when the email was spilled to the outbox instead.
+        """
+        self.start()
+        item = (time.monotonic(), email)
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            if self.when_full != BLOCK:
+                return self.spill(email)
+            self.count("blocked")
+            try:
+                self.queue.put(item, timeout=self.block_timeout)
+            except queue.Full:
+                return self.spill(email)
+        self.count("submitted")
+        return True
+
+    def spill(self, email):
+        from apps.core.utils import queue_email
+
+        logger.warning(
+            f"Email dispatch queue is full ({self.queue_size}), "
+            f"writing the email to {email['recipient_email']} to the outbox."
+        )
+        queue_email(**email)
+        self.count("spilled")
+        return False
+
+    def work(self, jobs):
+        from apps.core.utils import send_email_via_mailjet
+
+        while True:
+            queued_at, email = jobs.get()
+            try:
+                sent = send_email_via_mailjet(**email)
+            except Exception as e:
+                logger.exception(f"Error dispatching email: {e}")
+                sent = False
+            latency = time.monotonic() - queued_at
+            with self.lock:
+                self.counters["sent" if sent else "failed"] += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+            jobs.task_done()
+
+    def count(self, counter):
+        with self.lock:
+            self.counters[counter] += 1
+
+    def stats(self):
+        """
+        Return the counters of this process.
+
+        Latencies run from submission to the end of the Mailjet call, in
+        milliseconds.
+        """
+        with self.lock:
+            done = self.counters["sent"] + self.counters["failed"]
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queue_depth": self.queue.qsize() if self.queue else 0,
+                **self.counters,
+                "average_latency_ms": round(self.total_latency / done * 1000, 1)
+                if done
+                else 0.0,
+                "max_latency_ms": round(self.max_latency * 1000, 1),
+            }
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """Return the email dispatcher of this process, creating it once."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = EmailDispatcher(
+                workers=settings.EMAIL_DISPATCH_WORKERS,
+                queue_size=settings.EMAIL_DISPATCH_QUEUE_SIZE,
+                when_full=settings.EMAIL_DISPATCH_WHEN_FULL,
+                block_timeout=settings.EMAIL_DISPATCH_BLOCK_TIMEOUT,
+            )
+        return _dispatcher
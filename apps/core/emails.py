@@ -0,0 +1,177 @@
+"""Rendering of one notification template for many recipients."""
+
+import logging
+import re
+
+from django.template import Context
+from django.template.base import render_value_in_context
+from django.template.loader import render_to_string
+
+logger = logging.getLogger(__name__)
+
+TOKEN = "__bulk_email_{}__"
+TOKEN_PATTERN = re.compile(r"__bulk_email_(\w+?)__")
+
+# Attributes of the recipient that templates may use, keyed by placeholder.
+USER_FIELDS = {
+    "user_first_name": lambda user: user.first_name,
+    "user_last_name": lambda user: user.last_name,
+    "user_get_full_name": lambda user: user.get_full_name(),
+    "user_username": lambda user: user.username,
+    "user_email": lambda user: user.email,
+}
+
+
+class PlaceholderUser:
+    """Stands in for the recipient while the template is rendered once."""
+
+    first_name = TOKEN.format("user_first_name")
+    last_name = TOKEN.format("user_last_name")
+    username = TOKEN.format("user_username")
+    email = TOKEN.format("user_email")
+
+    def get_full_name(self):
+        return TOKEN.format("user_get_full_name")
+
+
+class SampleUser:
+    """A recipient whose fields all hold the same sample value."""
+
+    def __init__(self, value):
+        self.first_name = self.last_name = self.username = self.email = value
+        self.value = value
+
+    def get_full_name(self):
+        return self.value
+
+
+# Values given to every placeholder to catch templates that filter or
+# branch on them: a number (intcomma, floatformat), words (title, upper)
+# and an empty value ({% if %}, default).
+SAMPLE_VALUES = ("1234.5678", "bulk sample", "")
+
+
+class BulkEmailRenderer:
+    """
+    Renders the HTML and text templates of a notification once, with
+    placeholders for the recipient's fields, and fills them in for each
+    recipient.
+
+    Per-recipient values must be output as they are, without filters or
+    conditions. Sample recipients, and then the first real one, are also
+    rendered the normal way and compared, and a template that does not
+    match falls back to a full render per recipient.
+
+    Args:
+        subject (str): Subject of the emails.
+        template_name (str): Template path without the .html/.txt extension.
+        context (dict): Context shared by every recipient.
+        fields (tuple): Names of extra per-recipient context values.
+    """
+
+    def __init__(self, subject, template_name, context, fields=()):
+        self.subject = subject
+        self.template_name = template_name
+        self.context = context
+        self.fields = fields
+        self.html_content = self.text_content = None
+        self.verified = False
+        # Values are escaped and localized exactly as {{ value }} would be.
+        self.value_context = Context(autoescape=True)
+
+        placeholders = {field: TOKEN.format(field) for field in fields}
+        try:
+            placeholder_context = {**context, **placeholders, "user": PlaceholderUser()}
+            self.html_content = render_to_string(
+                f"{template_name}.html", placeholder_context
+            )
+            self.text_content = render_to_string(
+                f"{template_name}.txt", placeholder_context
+            ).strip()
+            # Alternating literal text and placeholder names.
+            self.html_parts = TOKEN_PATTERN.split(self.html_content)
+            self.text_parts = TOKEN_PATTERN.split(self.text_content)
+            self.names = set(self.html_parts[1::2] + self.text_parts[1::2])
+        except Exception as e:
+            logger.error(
+                f"Error pre-rendering {template_name}, rendering per user: {e}"
+            )
+            return
+
+        if not self.matches_samples():
+            logger.warning(
+                f"{template_name} transforms per-user fields, rendering it per user."
+            )
+            self.html_content = None
+
+    def matches_samples(self):
+        """Whether filling in the sample recipients matches rendering them."""
+        for value in SAMPLE_VALUES:
+            user = SampleUser(value)
+            values = dict.fromkeys(self.fields, value)
+            try:
+                rendered = self.render_full(user, values)
+            except Exception:
+                return False
+            resolved = self.resolve(user, values)
+            filled = (
+                self.fill(self.html_parts, resolved),
+                self.fill(self.text_parts, resolved),
+            )
+            if filled != rendered:
+                return False
+        return True
+
+    def render(self, user, **values):
+        """
+        Return the email of one recipient as EmailOutbox field values.
+
+        Args:
+            user (User): The recipient.
+            **values: The per-recipient fields given to the renderer.
+        """
+        if self.html_content is None:
+            html_content, text_content = self.render_full(user, values)
+        else:
+            resolved = self.resolve(user, values)
+            html_content = self.fill(self.html_parts, resolved)
+            text_content = self.fill(self.text_parts, resolved)
+            if not self.verified:
+                if (html_content, text_content) != self.render_full(user, values):
+                    logger.warning(
+                        f"{self.template_name} transforms per-user fields, "
+                        "rendering it per user."
+                    )
+                    self.html_content = None
+                    html_content, text_content = self.render_full(user, values)
+                self.verified = True
+
+        return {
+            "subject": self.subject,
+            "html_content": html_content,
+            "text_content": text_content,
+            "recipient_email": user.email,
+            "recipient_name": user.get_full_name(),
+        }
+
+    def render_full(self, user, values):
+        context = {**self.context, **values, "user": user}
+        return (
+            render_to_string(f"{self.template_name}.html", context),
+            render_to_string(f"{self.template_name}.txt", context).strip(),
+        )
+
+    def resolve(self, user, values):
+        """Return the rendered value of each placeholder for a recipient."""
+        return {
+            name: render_value_in_context(
+                USER_FIELDS[name](user) if name in USER_FIELDS else values[name],
+                self.value_context,
+            )
+            for name in self.names
+        }
+
+    def fill(self, parts, resolved):
+        parts = parts[:]
+        parts[1::2] = [resolved[name] for name in parts[1::2]]
+        return "".join(parts)
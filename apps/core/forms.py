@@ -0,0 +1,37 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.exports import EXPORT_FORMATS
+
+
+class ExportForm(forms.Form):
+    """Validates the filters of a record export."""
+
+    format = forms.ChoiceField(
+        choices=[(name, name.upper()) for name in EXPORT_FORMATS],
+        required=False,
+        initial="csv",
+    )
+    start = forms.DateField(
+        required=False,
+        help_text=_("First day included (YYYY-MM-DD)."),
+    )
+    end = forms.DateField(
+        required=False,
+        help_text=_("Last day included (YYYY-MM-DD)."),
+    )
+    status = forms.CharField(
+        max_length=2,
+        required=False,
+        help_text=_("Status code, or transaction type for audit logs."),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start"), cleaned_data.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError(
+                _("The start date must not be after the end date.")
+            )
+        cleaned_data["format"] = cleaned_data.get("format") or "csv"
+        return cleaned_data
@@ -0,0 +1,102 @@
+"""Batch sending through the Mailjet v3.1 send API over a reused connection."""
+
+import logging
+import threading
+from urllib.parse import urljoin
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Largest number of messages the v3.1 send API accepts in one call.
+MAILJET_MAX_BATCH_SIZE = 50
+MAILJET_TIMEOUT = 30
+
+
+class MailjetBatchSender:
+    """
+    Sends emails in batches of up to MAILJET_MAX_BATCH_SIZE messages per
+    HTTP call, keeping the connection to Mailjet open between calls.
+    """
+
+    def __init__(self, api_url=None):
+        self.url = urljoin(api_url or settings.MAILJET_API_URL, "v3.1/send")
+        self.session = requests.Session()
+        self.session.auth = (settings.MAILJET_API_KEY, settings.MAILJET_SECRET_KEY)
+        self.sender = {
+            "Email": settings.DEFAULT_FROM_EMAIL,
+            "Name": settings.MAILJET_SENDER_NAME,
+        }
+
+    def message(self, email):
+        return {
+            "From": self.sender,
+            "To": [
+                {
+                    "Email": email.recipient_email,
+                    "Name": email.recipient_name or email.recipient_email.split("@")[0],
+                }
+            ],
+            "Subject": email.subject,
+            "TextPart": email.text_content,
+            "HTMLPart": email.html_content,
+            "CustomID": str(email.outbox_id),
+        }
+
+    def send(self, emails):
+        """
+        Send outbox emails and return the outcome of each one.
+
+        Returns:
+            list: (sent, provider message ID, error, retryable) tuples, in
+            the order of the emails. Messages Mailjet rejected on their own
+            are not retryable; failed calls are.
+        """
+        results = []
+        for start in range(0, len(emails), MAILJET_MAX_BATCH_SIZE):
+            results += self.send_batch(emails[start : start + MAILJET_MAX_BATCH_SIZE])
+        return results
+
+    def send_batch(self, emails):
+        try:
+            response = self.session.post(
+                self.url,
+                json={"Messages": [self.message(email) for email in emails]},
+                timeout=MAILJET_TIMEOUT,
+            )
+            body = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error sending {len(emails)} emails through Mailjet: {e}")
+            return [(False, "", str(e), True)] * len(emails)
+
+        statuses = body.get("Messages") if isinstance(body, dict) else None
+        if not statuses or len(statuses) != len(emails):
+            # The whole call was rejected, for instance on bad credentials.
+            error = f"Mailjet returned {response.status_code}: {body}"
+            logger.error(error)
+            return [(False, "", error, True)] * len(emails)
+
+        results = []
+        for status in statuses:
+            if status.get("Status") == "success":
+                recipients = status.get("To") or [{}]
+                message_id = str(recipients[0].get("MessageID", ""))
+                results.append((True, message_id, "", False))
+            else:
+                errors = status.get("Errors") or []
+                error = "; ".join(e.get("ErrorMessage", "") for e in errors)
+                results.append(
+                    (False, "", error or "Mailjet rejected the message.", False)
+                )
+        return results
+
+
+_local = threading.local()
+
+
+def get_batch_sender():
+    """Return the batch sender of the current thread, creating it once."""
+    if getattr(_local, "sender", None) is None:
+        _local.sender = MailjetBatchSender()
+    return _local.sender
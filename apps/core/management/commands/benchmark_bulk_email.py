@@ -0,0 +1,77 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from apps.core.emails import BulkEmailRenderer
+
+User = get_user_model()
+
+TEMPLATE_NAME = "accounts/bettor/bundles/email/payout"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rendering a payout notification per recipient with "
+        "render_to_string against BulkEmailRenderer. Nothing is written to "
+        "the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recipients",
+            type=int,
+            default=10000,
+            help="Number of recipients rendered.",
+        )
+
+    def handle(self, *args, **options):
+        recipients = [
+            (
+                User(
+                    username=f"bettor{index}",
+                    first_name=f"Bettor {index}",
+                    last_name="O'Neil",
+                    email=f"bettor{index}@example.com",
+                ),
+                Decimal("1200.00") + index,
+            )
+            for index in range(options["recipients"])
+        ]
+        context = {"bundle": {"name": "Weekend Accumulator"}}
+
+        started = time.perf_counter()
+        per_recipient = [
+            (
+                render_to_string(
+                    f"{TEMPLATE_NAME}.html", {**context, "user": user, "amount": amount}
+                ),
+                render_to_string(
+                    f"{TEMPLATE_NAME}.txt", {**context, "user": user, "amount": amount}
+                ).strip(),
+            )
+            for user, amount in recipients
+        ]
+        self.report("render_to_string per recipient", started, len(recipients) * 2)
+
+        started = time.perf_counter()
+        renderer = BulkEmailRenderer(
+            "Payout", TEMPLATE_NAME, context, fields=("amount",)
+        )
+        bulk = [renderer.render(user, amount=amount) for user, amount in recipients]
+        # Two renders up front and two for the check of the first recipient.
+        self.report("BulkEmailRenderer", started, 4)
+
+        identical = all(
+            (email["html_content"], email["text_content"]) == expected
+            for email, expected in zip(bulk, per_recipient)
+        )
+        self.stdout.write(f"Output identical: {identical}")
+
+    def report(self, label, started, renders):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label}: {renders} template renders in {elapsed * 1000:.1f}ms"
+        )
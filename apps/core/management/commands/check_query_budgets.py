@@ -0,0 +1,286 @@
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import URLResolver, get_resolver
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from apps.accounts.tokens import account_activation_token
+from apps.core.middleware import QueryStats
+from apps.groups.models import Bundle, Group, GroupRequest, Payout, Purchase
+from apps.tickets.models import Ticket
+from apps.wallets.models import Deposit, Withdrawal
+
+User = get_user_model()
+
+BUDGETS_FILE = settings.BASE_DIR / "config" / "query_budgets.json"
+
+# URLs requested without logging in, by namespace.
+ANONYMOUS_NAMESPACES = {"auth"}
+# URLs requested as a staff user, by path prefix; the rest as a bettor.
+ADMIN_PREFIX = "administrator/"
+# Path prefixes not covered: the Django admin and its documentation.
+SKIPPED_PREFIXES = ("admin/",)
+SKIPPED_URLS = {
+    "auth:logout",
+    # These crash until their templates, accounts/administrator/users/
+    # verified.html and unverified.html, are added.
+    "administrator:users_unverified",
+    "administrator:users_verified",
+}
+
+
+def url_patterns(patterns=None, namespace=None, prefix=""):
+    """Yield the (name, route, converters) of every URL pattern."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from url_patterns(
+                pattern.url_patterns,
+                pattern.namespace or namespace,
+                prefix + str(pattern.pattern),
+            )
+        elif pattern.name and not prefix.startswith(SKIPPED_PREFIXES):
+            yield (
+                f"{namespace}:{pattern.name}" if namespace else pattern.name,
+                prefix + str(pattern.pattern),
+                list(pattern.pattern.converters),
+            )
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every URL of config/urls.py against a seeded test database "
+        "and compare the number of SQL queries of each with the budgets in "
+        "config/query_budgets.json. Fails when a URL exceeds its budget, has "
+        "none, or returns another status code than recorded. Use --update to "
+        "record the current counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bettors",
+            type=int,
+            default=20,
+            help="Number of bettors seeded, so N+1 queries show in the counts.",
+        )
+        parser.add_argument(
+            "--update",
+            action="store_true",
+            help="Write the current counts as the new budgets.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            # A private cache, so no state leaks from or into the real one.
+            with override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                        "LOCATION": "query-budgets",
+                    }
+                }
+            ):
+                counts = self.measure(options["bettors"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["update"]:
+            budgets = {
+                name: {"queries": count, "status": status}
+                for name, (status, count) in counts.items()
+            }
+            BUDGETS_FILE.write_text(
+                json.dumps(
+                    {"bettors": options["bettors"], "budgets": budgets},
+                    indent=4,
+                    sort_keys=True,
+                )
+                + "\n"
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Wrote {len(budgets)} budgets to {BUDGETS_FILE}.")
+            )
+            return
+
+        self.compare(counts, options["bettors"])
+
+    def compare(self, counts, bettors):
+        try:
+            recorded = json.loads(BUDGETS_FILE.read_text())
+        except FileNotFoundError:
+            raise CommandError(f"No budgets in {BUDGETS_FILE}, run with --update.")
+        if recorded["bettors"] != bettors:
+            raise CommandError(
+                f"The budgets were recorded with --bettors {recorded['bettors']}."
+            )
+
+        failures = []
+        for name, (status, count) in sorted(counts.items()):
+            budget = recorded["budgets"].get(name)
+            if budget is None:
+                failures.append(f"{name} has no budget ({count} queries)")
+                self.stdout.write(f"{count:>4} /    -  {status}  {name}")
+                continue
+            if status != budget["status"]:
+                failures.append(
+                    f"{name} returned {status} instead of {budget['status']}"
+                )
+            if count > budget["queries"]:
+                failures.append(
+                    f"{name} ran {count} queries, budget {budget['queries']}"
+                )
+            self.stdout.write(f"{count:>4} / {budget['queries']:>4}  {status}  {name}")
+
+        if failures:
+            raise CommandError("Query budget check failed:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS(f"{len(counts)} URLs within budget."))
+
+    def measure(self, bettors):
+        """Return the (status code, query count) of every URL."""
+        data = self.seed(bettors)
+        admin_client = Client(raise_request_exception=False)
+        admin_client.force_login(data["admin"])
+        bettor_client = Client(raise_request_exception=False)
+        bettor_client.force_login(data["bettor"])
+        anonymous_client = Client(raise_request_exception=False)
+
+        counts = {}
+        # Staff URLs last, as some of them change the seeded users.
+        patterns = sorted(
+            url_patterns(), key=lambda pattern: pattern[1].startswith(ADMIN_PREFIX)
+        )
+        for name, route, converters in patterns:
+            if name in SKIPPED_URLS:
+                continue
+            kwargs = {**data["kwargs"], **data["overrides"].get(name, {})}
+            path = "/" + route
+            for converter in converters:
+                path = path.replace(
+                    f"<{route_converter(route, converter)}>", str(kwargs[converter])
+                )
+
+            if name.split(":")[0] in ANONYMOUS_NAMESPACES:
+                client = anonymous_client
+            elif route.startswith(ADMIN_PREFIX):
+                client = admin_client
+            else:
+                client = bettor_client
+
+            stats = QueryStats()
+            with connection.execute_wrapper(stats):
+                response = client.get(path)
+            counts[name] = (response.status_code, stats.count)
+        return counts
+
+    def seed(self, bettors):
+        """Create the users, groups, bundles and transactions requested."""
+        admin = User.objects.create_user(
+            "budget-admin", "budget-admin@example.com", "password", is_staff=True
+        )
+        users = []
+        for index in range(bettors):
+            user = User.objects.create_user(
+                f"bettor{index}", f"bettor{index}@example.com", "password"
+            )
+            profile = user.profile
+            profile.email_confirmed = True
+            profile.transaction_pin = "pin"
+            profile.payout_information = "Bank"
+            profile.phone_number = "08000000000"
+            profile.save()
+            users.append(user)
+
+        bundles = []
+        for index in range(3):
+            group = Group.objects.create(name=f"Group {index}", description="Group")
+            group.bettors.add(*users)
+            bundles.append(
+                Bundle.objects.create(
+                    group=group,
+                    name=f"Bundle {index}",
+                    price=Decimal("100.00"),
+                    winning_percentage=Decimal("20.00"),
+                    min_bundles_per_user=1,
+                    max_bundles_per_user=5,
+                )
+            )
+
+        for index, user in enumerate(users):
+            wallet = user.wallet
+            for bundle in bundles[:2]:
+                purchase = Purchase.objects.create(
+                    user=user,
+                    bundle=bundle,
+                    quantity=1,
+                    amount=Decimal("100.00"),
+                    payout_amount=Decimal("120.00"),
+                    status=Purchase.Status.APPROVED,
+                    reference=f"P{index}{bundle.pk}",
+                )
+                bundle.participants.add(user)
+                Payout.objects.create(
+                    user=user,
+                    bundle=bundle,
+                    purchase=purchase,
+                    amount=Decimal("120.00"),
+                )
+            Deposit.objects.create(
+                user=user, wallet=wallet, reference=f"D{index}", amount=Decimal("500")
+            )
+            Withdrawal.objects.create(
+                user=user, wallet=wallet, reference=f"W{index}", amount=Decimal("50")
+            )
+            Ticket.objects.create(user=user, subject="Help", description="Help")
+
+        requests = [
+            GroupRequest.objects.create(user=user, group=bundles[2].group)
+            for user in users[:2]
+        ]
+        bettor, other = users[0], users[-1]
+        uidb64 = urlsafe_base64_encode(force_bytes(other.pk))
+        return {
+            "admin": admin,
+            "bettor": bettor,
+            "kwargs": {
+                "dataset": "deposits",
+                "withdrawal_id": Withdrawal.objects.filter(user=bettor)
+                .first()
+                .withdrawal_id,
+                "username": other.username,
+                "request_id": requests[0].pk,
+                "group_id": bundles[0].group.group_id,
+                "bundle_id": bundles[0].bundle_id,
+                "purchase_id": Purchase.objects.filter(user=bettor).first().purchase_id,
+                "reference": Deposit.objects.filter(user=bettor).first().reference,
+                "ticket_id": Ticket.objects.filter(user=bettor).first().ticket_id,
+                "uidb64": uidb64,
+                "token": default_token_generator.make_token(other),
+            },
+            "overrides": {
+                "groups:reject_request": {"request_id": requests[1].pk},
+                "auth:activate": {"token": account_activation_token.make_token(other)},
+            },
+        }
+
+
+def route_converter(route, name):
+    """Return the "<converter:name>" or "<name>" of a route without brackets."""
+    for part in route.split("<")[1:]:
+        part = part.split(">")[0]
+        if part.split(":")[-1] == name:
+            return part
+    return name
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.outbox import deliver_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver the pending emails of the outbox in batches. With --loop it "
+        "keeps polling and can run as a dedicated worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Number of emails claimed per batch.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is empty.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_outbox(batch_size=options["batch_size"])
+            if sent or failed or not options["loop"]:
+                self.stdout.write(f"{sent} emails sent, {failed} failed.")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
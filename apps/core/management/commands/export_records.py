@@ -0,0 +1,54 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from apps.core.exports import EXPORT_FORMATS, EXPORTS, stream_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream audit logs, deposits, withdrawals, purchases or payouts to a "
+        "CSV or JSONL file in constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORTS))
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORT_FORMATS),
+            default="csv",
+            help="Output format.",
+        )
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            help="First day included (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--end",
+            type=date.fromisoformat,
+            help="Last day included (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--status",
+            help="Status code, or transaction type for audit logs.",
+        )
+        parser.add_argument(
+            "--output",
+            help="File written to. Defaults to standard output.",
+        )
+
+    def handle(self, *args, **options):
+        chunks = stream_export(
+            options["dataset"],
+            options["format"],
+            start=options["start"],
+            end=options["end"],
+            status=options["status"],
+        )
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,83 @@
+import itertools
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+message_ids = itertools.count(1)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers POST /v3.1/send the way Mailjet does, without sending anything."""
+
+    # Keep connections open between calls, as Mailjet does.
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v3.1/send":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        messages = json.loads(self.rfile.read(length)).get("Messages", [])
+        statuses = [self.status(message) for message in messages]
+        failed = any(status["Status"] != "success" for status in statuses)
+
+        body = json.dumps({"Messages": statuses}).encode()
+        self.send_response(400 if failed else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.command.stdout.write(
+            f"Accepted {len(messages)} messages in one call"
+            + (" (some rejected)" if failed else "")
+        )
+
+    def status(self, message):
+        recipient = message["To"][0]["Email"]
+        # Recipients starting with "reject" exercise the per-message errors.
+        if recipient.startswith("reject"):
+            return {
+                "Status": "error",
+                "CustomID": message.get("CustomID", ""),
+                "Errors": [{"ErrorMessage": f"Stub rejected {recipient}."}],
+            }
+        message_id = next(message_ids)
+        return {
+            "Status": "success",
+            "CustomID": message.get("CustomID", ""),
+            "To": [
+                {
+                    "Email": recipient,
+                    "MessageUUID": f"stub-{message_id}",
+                    "MessageID": message_id,
+                }
+            ],
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stub of the Mailjet v3.1 send API for development. Point "
+        "MAILJET_API_URL at it, e.g. http://127.0.0.1:8025/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8025)
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(("127.0.0.1", options["port"]), StubHandler)
+        server.command = self
+        self.stdout.write(
+            f"Mailjet stub listening on http://127.0.0.1:{options['port']}/"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,83 @@
+import logging
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Database execute wrapper recording the queries run while it is
+    installed with connection.execute_wrapper().
+    """
+
+    def __init__(self):
+        self.statements = Counter()
+        self.queries = Counter()
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.statements[sql] += 1
+            self.queries[(sql, repr(params))] += 1
+
+    @property
+    def count(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        """Queries repeating an earlier one with the same parameters."""
+        return self.count - len(self.queries)
+
+    @property
+    def similar(self):
+        """Queries repeating an earlier statement with other parameters, as in N+1."""
+        return len(self.queries) - len(self.statements)
+
+    def most_repeated(self):
+        sql, count = self.statements.most_common(1)[0] if self.statements else ("", 0)
+        return sql, count
+
+
+class QueryBudgetMiddleware:
+    """
+    Development middleware recording the SQL queries of each request: how
+    many ran, how many repeat an earlier query, and the time spent in the
+    database. They are returned as X-Query-* response headers and logged,
+    as a warning when the count exceeds QUERY_BUDGET_WARN.
+
+    Queries run while a streaming response is iterated are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+
+        response["X-Query-Count"] = stats.count
+        response["X-Query-Duplicates"] = stats.duplicates
+        response["X-Query-Similar"] = stats.similar
+        response["X-Query-Time-Ms"] = f"{stats.duration * 1000:.1f}"
+
+        message = (
+            f"{request.method} {request.path}: {stats.count} queries, "
+            f"{stats.duplicates} duplicate, {stats.similar} similar, "
+            f"{stats.duration * 1000:.1f}ms"
+        )
+        if stats.count > settings.QUERY_BUDGET_WARN:
+            sql, repeats = stats.most_repeated()
+            logger.warning(f"{message}. Most repeated ({repeats}x): {sql[:200]}")
+        else:
+            logger.info(message)
+        return response
@@ -0,0 +1,94 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:16
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "outbox_id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="Subject")),
+                (
+                    "text_content",
+                    models.TextField(blank=True, verbose_name="Text Content"),
+                ),
+                (
+                    "html_content",
+                    models.TextField(blank=True, verbose_name="HTML Content"),
+                ),
+                (
+                    "recipient_email",
+                    models.EmailField(max_length=254, verbose_name="Recipient Email"),
+                ),
+                (
+                    "recipient_name",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="Recipient Name"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("P", "Pending"), ("S", "Sent"), ("F", "Failed")],
+                        default="P",
+                        max_length=1,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0,
+                        help_text="Number of delivery attempts made.",
+                        verbose_name="Attempts",
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Time from which the email may be picked up for delivery.",
+                        verbose_name="Next Attempt At",
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="Last Error")),
+                (
+                    "sent_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Sent At"),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Email Outbox",
+                "verbose_name_plural": "Email Outbox",
+                "ordering": ["-created"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="core_emailo_status_a125e4_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailoutbox",
+            name="provider_message_id",
+            field=models.CharField(
+                blank=True,
+                help_text="ID Mailjet assigned to the delivered message.",
+                max_length=64,
+                verbose_name="Provider Message ID",
+            ),
+        ),
+    ]
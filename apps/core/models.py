@@ -1,4 +1,7 @@
+import uuid
+
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -21,3 +24,88 @@ class FrequentlyAskedQuestion(models.Model):
 
     def __str__(self):
         return self.question
+
+
+class EmailOutbox(models.Model):
+    """
+    An email waiting to be delivered by the outbox worker.
+
+    Emails are written in the same transaction as the change they report,
+    so they are neither lost when a worker process recycles nor sent for a
+    change that was rolled back.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "P", _("Pending")
+        SENT = "S", _("Sent")
+        FAILED = "F", _("Failed")
+
+    outbox_id = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+    )
+    subject = models.CharField(
+        _("Subject"),
+        max_length=255,
+    )
+    text_content = models.TextField(
+        _("Text Content"),
+        blank=True,
+    )
+    html_content = models.TextField(
+        _("HTML Content"),
+        blank=True,
+    )
+    recipient_email = models.EmailField(
+        _("Recipient Email"),
+    )
+    recipient_name = models.CharField(
+        _("Recipient Name"),
+        max_length=255,
+        blank=True,
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=1,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        _("Attempts"),
+        default=0,
+        help_text=_("Number of delivery attempts made."),
+    )
+    next_attempt_at = models.DateTimeField(
+        _("Next Attempt At"),
+        default=timezone.now,
+        help_text=_("Time from which the email may be picked up for delivery."),
+    )
+    last_error = models.TextField(
+        _("Last Error"),
+        blank=True,
+    )
+    provider_message_id = models.CharField(
+        _("Provider Message ID"),
+        max_length=64,
+        blank=True,
+        help_text=_("ID Mailjet assigned to the delivered message."),
+    )
+    sent_at = models.DateTimeField(
+        _("Sent At"),
+        blank=True,
+        null=True,
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created"]
+        verbose_name = _("Email Outbox")
+        verbose_name_plural = _("Email Outbox")
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.recipient_email} ({self.get_status_display()})"
@@ -0,0 +1,112 @@
+"""Delivery of the email outbox in bounded batches with retry and backoff."""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.mailjet import get_batch_sender
+from apps.core.models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed email is hidden from other workers while it is sent.
+# An email whose worker died is picked up again once the lease runs out.
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def claim_batch(batch_size):
+    """
+    Claim a batch of due emails for this worker.
+
+    The emails are locked with SKIP LOCKED where the database supports it
+    and their next attempt is pushed past the lease, so concurrent workers
+    never claim the same email. The transaction is kept short so no lock is
+    held while emails are sent.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        EmailOutbox.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=now + CLAIM_LEASE,
+            updated=now,
+        )
+    return batch
+
+
+def retry_delay(attempts):
+    """Return the exponential backoff after a number of failed attempts."""
+    return timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def deliver_batch(batch):
+    """
+    Send a claimed batch through Mailjet's batch API and record the outcome
+    and provider message ID of each email.
+    """
+    results = get_batch_sender().send(batch)
+    now = timezone.now()
+    sent = failed = 0
+    for email, (delivered, message_id, error, retryable) in zip(batch, results):
+        email.attempts += 1
+        email.updated = now
+        if delivered:
+            email.status = EmailOutbox.Status.SENT
+            email.provider_message_id = message_id
+            email.sent_at = now
+            email.last_error = ""
+            sent += 1
+        else:
+            email.last_error = error
+            if not retryable or email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = EmailOutbox.Status.FAILED
+                failed += 1
+            else:
+                email.next_attempt_at = now + retry_delay(email.attempts)
+
+    EmailOutbox.objects.bulk_update(
+        batch,
+        [
+            "status",
+            "attempts",
+            "next_attempt_at",
+            "last_error",
+            "provider_message_id",
+            "sent_at",
+            "updated",
+        ],
+    )
+    return sent, failed
+
+
+def deliver_outbox(batch_size=None, max_batches=None):
+    """
+    Deliver due emails in batches until none are left.
+
+    Args:
+        batch_size (int): Emails claimed per batch.
+        max_batches (int): Optional limit on the number of batches.
+
+    Returns:
+        tuple: Number of emails sent and number that failed for good.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent = failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        batch = claim_batch(batch_size)
+        if not batch:
+            break
+        batch_sent, batch_failed = deliver_batch(batch)
+        sent += batch_sent
+        failed += batch_failed
+        batches += 1
+
+    if sent or failed:
+        logger.info(f"Email outbox: {sent} sent, {failed} failed.")
+    return sent, failed
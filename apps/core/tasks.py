@@ -0,0 +1,12 @@
+"""Celery tasks of the core app."""
+
+from celery import shared_task
+
+from apps.core.outbox import deliver_outbox
+
+
+@shared_task
+def deliver_email_outbox_task():
+    """Drain the email outbox."""
+    sent, failed = deliver_outbox()
+    return {"sent": sent, "failed": failed}
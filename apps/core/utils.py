@@ -1,13 +1,17 @@
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 import logging
-import threading
 from mailjet_rest import Client
 from django.conf import settings
 import datetime
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 from django.utils import timezone
 
 from apps.accounts.models import Action
+from apps.core.dispatch import get_dispatcher
+from apps.core.models import EmailOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,7 @@ def send_email_via_mailjet(
         mailjet = Client(
             auth=(settings.MAILJET_API_KEY, settings.MAILJET_SECRET_KEY),
             version="v3.1",
+            api_url=settings.MAILJET_API_URL,
         )
 
         sender = {
@@ -52,34 +57,86 @@ def send_email_via_mailjet(
             logger.error(
                 f"Failed to send email to {recipient_email}: {result.status_code} {result.json()}"
             )
-        else:
-            logger.info(
-                f"Email sent successfully to {recipient_email}: {result.status_code}"
-            )
+            return False
+        logger.info(
+            f"Email sent successfully to {recipient_email}: {result.status_code}"
+        )
+        return True
     except Exception as e:
         logger.exception(
             f"An error occurred while sending email to {recipient_email}: {str(e)}"
         )
+        return False
 
 
-def send_email_thread(
+def dispatch_email(
     subject,
     text_content,
     html_content,
     recipient_email,
     recipient_name=None,
 ):
-    email_thread = threading.Thread(
-        target=send_email_via_mailjet,
-        args=(
-            subject,
-            text_content,
-            html_content,
-            recipient_email,
-            recipient_name,
-        ),
+    """
+    Send an email right away on the process-wide dispatch pool, spilling
+    it to the outbox when the pool is saturated.
+    """
+    return get_dispatcher().submit(
+        {
+            "subject": subject,
+            "text_content": text_content,
+            "html_content": html_content,
+            "recipient_email": recipient_email,
+            "recipient_name": recipient_name,
+        }
     )
-    email_thread.start()
+
+
+def queue_email(
+    subject,
+    text_content,
+    html_content,
+    recipient_email,
+    recipient_name=None,
+):
+    """
+    Write an email to the outbox. It is delivered by the outbox worker once
+    the surrounding transaction commits, and discarded if it rolls back.
+    """
+    return queue_emails(
+        [
+            {
+                "subject": subject,
+                "text_content": text_content,
+                "html_content": html_content,
+                "recipient_email": recipient_email,
+                "recipient_name": recipient_name or "",
+            }
+        ]
+    )[0]
+
+
+def queue_emails(emails):
+    """
+    Write many emails to the outbox with a single insert.
+
+    :param emails: Dicts of EmailOutbox field values
+    :return: The created EmailOutbox entries
+    """
+    queued = EmailOutbox.objects.bulk_create([EmailOutbox(**email) for email in emails])
+    if queued:
+        transaction.on_commit(wake_outbox_worker)
+    return queued
+
+
+def wake_outbox_worker():
+    """Ask a Celery worker to drain the outbox now."""
+    from apps.core.tasks import deliver_email_outbox_task
+
+    try:
+        deliver_email_outbox_task.delay()
+    except Exception as e:
+        # The emails stay pending until the next deliver_email_outbox run.
+        logger.error(f"Error queueing email outbox delivery: {e}")
 
 
 def create_action(user, title, verb, target=None):
@@ -126,3 +183,37 @@ def mk_paginator(request, items, num_items):
         # If page is out of range, return the last page of results.
         items = paginator.page(paginator.num_pages)
     return items
+
+
+def keyset_paginate(request, items, num_items, field):
+    """
+    Function to paginate querysets newest first without OFFSET.
+
+    Pages are read from an index on (field, id) and continue after the
+    last item of the previous page, so deep pages cost the same as the
+    first one.
+
+    :param request: The current request object, whose "after" parameter
+        holds the cursor of the previous page
+    :param items: The queryset to be paginated
+    :param num_items: The number of items to be displayed per page
+    :param field: The date field the items are ordered by, newest first
+    :return: The items of the page and the cursor of the next page, or
+        None on the last page
+    """
+    items = items.order_by(f"-{field}", "-id")
+    cursor = request.GET.get("after", "")
+    value, _, pk = cursor.rpartition("_")
+    value = parse_datetime(value) if value else None
+    if value is not None and pk.isdigit():
+        items = items.filter(
+            Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": int(pk)})
+        )
+
+    page = list(items[: num_items + 1])
+    next_cursor = None
+    if len(page) > num_items:
+        page = page[:num_items]
+        last = page[-1]
+        next_cursor = f"{getattr(last, field).isoformat()}_{last.pk}"
+    return page, next_cursor
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Bundle, Group, Purchase, GroupRequest, Payout
+from .models import Bundle, Group, Purchase, GroupRequest, Payout, SettlementJob
 
 
 @admin.register(Group)
@@ -35,3 +35,16 @@ class GroupRequestAdmin(admin.ModelAdmin):
 @admin.register(Payout)
 class PayoutAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(SettlementJob)
+class SettlementJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "bundle",
+        "outcome",
+        "status",
+        "settled_purchases",
+        "total_purchases",
+        "created",
+    )
+    list_filter = ("status", "outcome")
@@ -0,0 +1,129 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.accounts.models import Action, Profile
+from apps.groups.models import Bundle, Group, Payout, Purchase, SettlementJob
+from apps.groups.settlement import (
+    SETTLEMENT_CHUNK_SIZE,
+    create_settlement_jobs,
+    run_settlement_jobs_in_pool,
+)
+from apps.wallets.models import AuditLog, Wallet
+
+User = get_user_model()
+
+FIXTURE_PREFIX = "settlement-benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure settlement throughput for a fixture bundle across worker counts. "
+        "The fixture data is created in the configured database and removed afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--purchases",
+            type=int,
+            default=5000,
+            help="Number of participants in the fixture bundle.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=[1, 2, 4],
+            help="Worker counts to benchmark.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SETTLEMENT_CHUNK_SIZE,
+            help="Number of purchases settled per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        bundle = self.create_fixture(options["purchases"])
+        try:
+            for workers in options["workers"]:
+                self.reset_fixture(bundle)
+                jobs = create_settlement_jobs(
+                    bundle, SettlementJob.Outcome.WON, None, partitions=workers
+                )
+                started = time.perf_counter()
+                run_settlement_jobs_in_pool(
+                    jobs,
+                    workers=workers,
+                    chunk_size=options["chunk_size"],
+                    notify=False,
+                )
+                elapsed = time.perf_counter() - started
+                settled = Payout.objects.filter(bundle=bundle).count()
+                self.stdout.write(
+                    f"{workers} worker(s): {settled} purchases in {elapsed:.2f}s "
+                    f"({settled / elapsed:.0f} purchases/s)"
+                )
+        finally:
+            self.delete_fixture(bundle)
+
+    @transaction.atomic
+    def create_fixture(self, count):
+        group = Group.objects.create(
+            name=f"{FIXTURE_PREFIX}-group",
+            description="Settlement benchmark fixture.",
+        )
+        bundle = Bundle.objects.create(
+            group=group,
+            name=f"{FIXTURE_PREFIX}-bundle",
+            price=Decimal("1000.00"),
+            winning_percentage=Decimal("20.00"),
+            min_bundles_per_user=1,
+            max_bundles_per_user=1,
+        )
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{FIXTURE_PREFIX}-{index}",
+                    email=f"{FIXTURE_PREFIX}-{index}@example.com",
+                )
+                for index in range(count)
+            ]
+        )
+        Profile.objects.bulk_create([Profile(user=user) for user in users])
+        Wallet.objects.bulk_create([Wallet(user=user) for user in users])
+        Purchase.objects.bulk_create(
+            [
+                Purchase(
+                    user=user,
+                    bundle=bundle,
+                    quantity=1,
+                    amount=bundle.price,
+                    payout_amount=Decimal("1200.00"),
+                    reference=f"BENCH{index}",
+                    status=Purchase.Status.APPROVED,
+                )
+                for index, user in enumerate(users)
+            ]
+        )
+        return bundle
+
+    @transaction.atomic
+    def reset_fixture(self, bundle):
+        wallets = Wallet.objects.filter(user__purchases__bundle=bundle)
+        AuditLog.objects.filter(wallet__in=wallets).delete()
+        wallets.update(balance=Decimal("0.00"))
+        Payout.objects.filter(bundle=bundle).delete()
+        bundle.settlement_jobs.all().delete()
+
+    @transaction.atomic
+    def delete_fixture(self, bundle):
+        users = User.objects.filter(username__startswith=f"{FIXTURE_PREFIX}-")
+        AuditLog.objects.filter(wallet__user__in=users).delete()
+        Action.objects.filter(user__in=users).delete()
+        Wallet.objects.filter(user__in=users).delete()
+        bundle.group.delete()
+        users.delete()
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from apps.groups.models import SettlementJob
+from apps.groups.settlement import (
+    SETTLEMENT_CHUNK_SIZE,
+    run_settlement_job,
+    run_settlement_jobs_in_pool,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every settlement job that has not completed, resuming from its checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SETTLEMENT_CHUNK_SIZE,
+            help="Number of purchases settled per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes running jobs in parallel.",
+        )
+
+    def handle(self, *args, **options):
+        jobs = list(
+            SettlementJob.objects.exclude(status=SettlementJob.Status.COMPLETED)
+            .select_related("bundle", "initiated_by")
+            .order_by("created")
+        )
+        if options["workers"] > 1:
+            results = run_settlement_jobs_in_pool(
+                jobs,
+                workers=options["workers"],
+                chunk_size=options["chunk_size"],
+            )
+            jobs = SettlementJob.objects.filter(
+                pk__in=[job_pk for job_pk, _ in results]
+            ).select_related("bundle")
+        else:
+            jobs = [
+                run_settlement_job(job, chunk_size=options["chunk_size"])
+                for job in jobs
+            ]
+
+        for job in jobs:
+            self.stdout.write(
+                f"{job}: {job.settled_purchases}/{job.total_purchases} purchases settled."
+            )
@@ -0,0 +1,124 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:58
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("groups", "0005_grouprequest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payout",
+            name="purchase",
+            field=models.OneToOneField(
+                blank=True,
+                help_text="The purchase this payout settles.",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="payout",
+                to="groups.purchase",
+                verbose_name="Purchase",
+            ),
+        ),
+        migrations.CreateModel(
+            name="SettlementJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "job_id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=[("W", "Won"), ("L", "Lost")],
+                        max_length=1,
+                        verbose_name="Outcome",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("P", "Pending"),
+                            ("R", "Running"),
+                            ("C", "Completed"),
+                            ("F", "Failed"),
+                        ],
+                        db_index=True,
+                        default="P",
+                        max_length=1,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "total_purchases",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Total Purchases"
+                    ),
+                ),
+                (
+                    "settled_purchases",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Settled Purchases"
+                    ),
+                ),
+                (
+                    "last_purchase_id",
+                    models.PositiveBigIntegerField(
+                        default=0,
+                        help_text="Primary key of the last purchase settled by this job.",
+                        verbose_name="Last Purchase ID",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Error")),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Completed At"
+                    ),
+                ),
+                (
+                    "bundle",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="settlement_jobs",
+                        to="groups.bundle",
+                        verbose_name="Bundle",
+                    ),
+                ),
+                (
+                    "initiated_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="settlement_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Initiated By",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Settlement Job",
+                "verbose_name_plural": "Settlement Jobs",
+                "ordering": ["-created"],
+            },
+        ),
+    ]
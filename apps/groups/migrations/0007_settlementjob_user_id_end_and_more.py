@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("groups", "0006_payout_purchase_settlementjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="settlementjob",
+            name="user_id_end",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="Highest user ID settled by this job (exclusive).",
+                null=True,
+                verbose_name="User ID End",
+            ),
+        ),
+        migrations.AddField(
+            model_name="settlementjob",
+            name="user_id_start",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="Lowest user ID settled by this job (inclusive).",
+                null=True,
+                verbose_name="User ID Start",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Links the payouts created before Payout.purchase existed to the purchase
+# they settled, so re-running a settlement skips those purchases. Each
+# payout is matched with the oldest approved purchase of the same user and
+# bundle that has no payout yet.
+
+from django.db import migrations
+
+APPROVED = "A"
+
+
+def backfill_payout_purchase(apps, schema_editor):
+    Payout = apps.get_model("groups", "Payout")
+    Purchase = apps.get_model("groups", "Purchase")
+
+    linked = set(
+        Payout.objects.filter(purchase__isnull=False).values_list(
+            "purchase_id", flat=True
+        )
+    )
+    payouts = Payout.objects.filter(purchase__isnull=True).order_by("pk")
+    for payout in payouts.iterator():
+        purchase_id = (
+            Purchase.objects.filter(
+                user_id=payout.user_id,
+                bundle_id=payout.bundle_id,
+                status=APPROVED,
+            )
+            .exclude(pk__in=linked)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if purchase_id is None:
+            continue
+        linked.add(purchase_id)
+        Payout.objects.filter(pk=payout.pk).update(purchase_id=purchase_id)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("groups", "0007_settlementjob_user_id_end_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_payout_purchase, migrations.RunPython.noop),
+    ]
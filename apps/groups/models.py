@@ -352,6 +352,15 @@ class Payout(TimeStampedModel):
         related_name="payouts",
         verbose_name=_("Bundle"),
     )
+    purchase = models.OneToOneField(
+        "Purchase",
+        on_delete=models.CASCADE,
+        related_name="payout",
+        blank=True,
+        null=True,
+        verbose_name=_("Purchase"),
+        help_text=_("The purchase this payout settles."),
+    )
     amount = models.DecimalField(
         max_digits=10,
         decimal_places=2,
@@ -372,3 +381,103 @@ class Payout(TimeStampedModel):
 
     def __str__(self):
         return f"Payout: {self.user.username} - Amount: {self.amount}"
+
+
+class SettlementJob(TimeStampedModel):
+    """
+    Tracks the settlement of a bundle outcome across its purchases.
+
+    Purchases are settled in primary key order and the job keeps a
+    checkpoint of the last settled purchase, so an interrupted job can be
+    run again and continues where it stopped. A settlement can be split
+    into several jobs covering disjoint ranges of user IDs, so jobs running
+    in parallel never touch the same wallet.
+    """
+
+    class Outcome(models.TextChoices):
+        WON = "W", _("Won")
+        LOST = "L", _("Lost")
+
+    class Status(models.TextChoices):
+        PENDING = "P", _("Pending")
+        RUNNING = "R", _("Running")
+        COMPLETED = "C", _("Completed")
+        FAILED = "F", _("Failed")
+
+    job_id = models.UUIDField(
+        default=uuid.uuid4,
+        editable=False,
+        unique=True,
+    )
+    bundle = models.ForeignKey(
+        "Bundle",
+        on_delete=models.CASCADE,
+        related_name="settlement_jobs",
+        verbose_name=_("Bundle"),
+    )
+    outcome = models.CharField(
+        max_length=1,
+        choices=Outcome.choices,
+        verbose_name=_("Outcome"),
+    )
+    status = models.CharField(
+        max_length=1,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("Status"),
+        db_index=True,
+    )
+    initiated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="settlement_jobs",
+        blank=True,
+        null=True,
+        verbose_name=_("Initiated By"),
+    )
+    user_id_start = models.PositiveBigIntegerField(
+        blank=True,
+        null=True,
+        verbose_name=_("User ID Start"),
+        help_text=_("Lowest user ID settled by this job (inclusive)."),
+    )
+    user_id_end = models.PositiveBigIntegerField(
+        blank=True,
+        null=True,
+        verbose_name=_("User ID End"),
+        help_text=_("Highest user ID settled by this job (exclusive)."),
+    )
+    total_purchases = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Total Purchases"),
+    )
+    settled_purchases = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Settled Purchases"),
+    )
+    last_purchase_id = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_("Last Purchase ID"),
+        help_text=_("Primary key of the last purchase settled by this job."),
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_("Error"),
+    )
+    completed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_("Completed At"),
+    )
+
+    class Meta:
+        verbose_name = _("Settlement Job")
+        verbose_name_plural = _("Settlement Jobs")
+        ordering = ["-created"]
+
+    def __str__(self):
+        return f"Settlement: {self.bundle.name} - {self.get_outcome_display()} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status == self.Status.COMPLETED
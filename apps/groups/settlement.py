@@ -0,0 +1,358 @@
+"""Resumable, bulk settlement of bundle outcomes for all participants."""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from celery import group as celery_group
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from apps.accounts.models import Action
+from apps.core.emails import BulkEmailRenderer
+from apps.core.utils import queue_emails
+from apps.wallets.models import AuditLog, Wallet
+
+from .models import Bundle, Payout, Purchase, SettlementJob
+from .workers import setup_settlement_worker
+
+logger = logging.getLogger(__name__)
+
+SETTLEMENT_CHUNK_SIZE = 500
+
+
+def payout_emails(bundle):
+    """Return the renderer of the winning payout notifications of a bundle."""
+    return BulkEmailRenderer(
+        "Congratulations! Bundle Winning Payout",
+        "accounts/bettor/bundles/email/payout",
+        {"bundle": bundle},
+        fields=("amount",),
+    )
+
+
+def lost_emails(bundle):
+    """Return the renderer of the final loss notifications of a bundle."""
+    return BulkEmailRenderer(
+        "Bundle Result: Lost",
+        "accounts/bettor/bundles/email/lost",
+        {"bundle": bundle},
+    )
+
+
+def queue_notifications(renderer, purchases):
+    """Write the notifications of a settled chunk to the email outbox."""
+    emails = []
+    for purchase in purchases:
+        try:
+            emails.append(renderer.render(purchase.user, amount=purchase.payout_amount))
+        except Exception as e:
+            logger.error(f"Error rendering settlement email for {purchase.user}: {e}")
+    queue_emails(emails)
+
+
+def settle_won_chunk(job, purchases):
+    """Credit the winnings of a chunk of purchases and record their payouts."""
+    Wallet.objects.bulk_apply(
+        [
+            (
+                purchase.user.wallet.pk,
+                purchase.payout_amount,
+                AuditLog.TransactionType.BUNDLE_WINNING,
+                get_random_string(length=12).upper(),
+            )
+            for purchase in purchases
+        ]
+    )
+    Payout.objects.bulk_create(
+        [
+            Payout(
+                user=purchase.user,
+                bundle=job.bundle,
+                purchase=purchase,
+                amount=purchase.payout_amount,
+            )
+            for purchase in purchases
+        ]
+    )
+    # Actions are attributed to the administrator who settled the bundle.
+    if job.initiated_by is not None:
+        Action.objects.bulk_create(
+            [
+                Action(
+                    user=job.initiated_by,
+                    title="Bundle Winning Payout",
+                    verb=f"{purchase.user} has been paid their bundle wins.",
+                    target=purchase.user.profile,
+                )
+                for purchase in purchases
+            ]
+        )
+
+
+def settle_lost_chunk(job, purchases):
+    """Record cancelled payouts for a chunk of purchases of a lost bundle."""
+    Payout.objects.bulk_create(
+        [
+            Payout(
+                user=purchase.user,
+                bundle=job.bundle,
+                purchase=purchase,
+                amount=0,
+                status=Payout.Status.CANCELLED,
+            )
+            for purchase in purchases
+        ]
+    )
+    # Actions are attributed to the administrator who settled the bundle.
+    if job.initiated_by is not None:
+        Action.objects.bulk_create(
+            [
+                Action(
+                    user=job.initiated_by,
+                    title="Bundle Lost Notification",
+                    verb=f"{purchase.user} has been notified of the lost bundle.",
+                    target=purchase.user.profile,
+                )
+                for purchase in purchases
+            ]
+        )
+
+
+SETTLEMENT_HANDLERS = {
+    SettlementJob.Outcome.WON: (settle_won_chunk, payout_emails),
+    SettlementJob.Outcome.LOST: (settle_lost_chunk, lost_emails),
+}
+
+
+def unsettled_purchases(job):
+    """Return the approved purchases in the job's user range not yet settled."""
+    purchases = job.bundle.purchases.filter(
+        status=Purchase.Status.APPROVED,
+        payout__isnull=True,
+    )
+    if job.outcome == SettlementJob.Outcome.WON:
+        purchases = purchases.filter(payout_amount__isnull=False)
+    if job.user_id_start is not None:
+        purchases = purchases.filter(user_id__gte=job.user_id_start)
+    if job.user_id_end is not None:
+        purchases = purchases.filter(user_id__lt=job.user_id_end)
+    return purchases
+
+
+def partition_user_ids(bundle, partitions):
+    """
+    Split the participants of a bundle into contiguous ranges of user IDs
+    holding roughly the same number of users.
+
+    Returns:
+        list: (start, end) tuples, with None for an open bound.
+    """
+    user_ids = list(
+        bundle.purchases.filter(status=Purchase.Status.APPROVED)
+        .order_by("user_id")
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    partitions = max(1, min(partitions, len(user_ids)))
+    bounds = [user_ids[len(user_ids) * i // partitions] for i in range(1, partitions)]
+    return list(zip([None, *bounds], [*bounds, None]))
+
+
+def create_settlement_jobs(bundle, outcome, initiated_by, partitions=None):
+    """Create one settlement job per user ID range of a bundle outcome."""
+    if partitions is None:
+        partitions = settings.SETTLEMENT_PARTITIONS
+    return SettlementJob.objects.bulk_create(
+        [
+            SettlementJob(
+                bundle=bundle,
+                outcome=outcome,
+                initiated_by=initiated_by,
+                user_id_start=start,
+                user_id_end=end,
+            )
+            for start, end in partition_user_ids(bundle, partitions)
+        ]
+    )
+
+
+def lock_unsettled_bundle(bundle):
+    """
+    Lock the row of a bundle for the surrounding transaction.
+
+    Returns:
+        Bundle: The locked bundle, or None when its outcome is already
+        settled or has settlement jobs that have not failed, so a replayed
+        or double-submitted outcome never pays participants twice.
+    """
+    bundle = Bundle.objects.select_for_update().get(pk=bundle.pk)
+    if bundle.status in (Bundle.Status.WON, Bundle.Status.LOST):
+        return None
+    if bundle.settlement_jobs.exclude(status=SettlementJob.Status.FAILED).exists():
+        return None
+    return bundle
+
+
+def start_settlement(bundle, outcome, initiated_by, partitions=None):
+    """
+    Create the settlement jobs of a bundle outcome and queue them on the
+    Celery workers once the surrounding transaction commits.
+    """
+    from .tasks import run_settlement_job_task
+
+    jobs = create_settlement_jobs(bundle, outcome, initiated_by, partitions)
+
+    def dispatch():
+        try:
+            celery_group(run_settlement_job_task.s(job.pk) for job in jobs).delay()
+        except Exception as e:
+            # The jobs stay pending and are picked up by resume_settlement_jobs.
+            logger.error(f"Error queueing settlement jobs for {bundle}: {e}")
+
+    transaction.on_commit(dispatch)
+    return jobs
+
+
+def settlement_progress(bundle):
+    """Summarise the settlement jobs of the latest outcome of a bundle."""
+    latest = bundle.settlement_jobs.order_by("-created").first()
+    if latest is None:
+        return None
+
+    jobs = bundle.settlement_jobs.filter(outcome=latest.outcome)
+    progress = jobs.aggregate(
+        settled=Sum("settled_purchases"),
+        total=Sum("total_purchases"),
+    )
+    statuses = set(jobs.values_list("status", flat=True))
+    if SettlementJob.Status.FAILED in statuses:
+        status = SettlementJob.Status.FAILED
+    elif statuses == {SettlementJob.Status.COMPLETED}:
+        status = SettlementJob.Status.COMPLETED
+    else:
+        status = SettlementJob.Status.RUNNING
+    progress["status"] = status
+    progress["status_display"] = SettlementJob.Status(status).label
+    return progress
+
+
+def run_settlement_jobs_in_pool(
+    jobs, workers, chunk_size=SETTLEMENT_CHUNK_SIZE, notify=True
+):
+    """
+    Run settlement jobs in parallel worker processes.
+
+    Jobs of the same settlement cover disjoint user ID ranges, so the
+    workers never contend for the same wallet rows. Each worker is set up
+    by setup_settlement_worker, under the fork and spawn start methods.
+
+    Returns:
+        list: The job primary keys with their final status.
+    """
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+    database_names = {
+        alias: connections[alias].settings_dict["NAME"] for alias in connections
+    }
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=setup_settlement_worker,
+        initargs=(database_names,),
+    ) as executor:
+        return list(
+            executor.map(
+                run_settlement_job_by_pk,
+                [job.pk for job in jobs],
+                repeat(chunk_size),
+                repeat(notify),
+            )
+        )
+
+
+def run_settlement_job_by_pk(job_pk, chunk_size=SETTLEMENT_CHUNK_SIZE, notify=True):
+    """Load and run a settlement job, returning its primary key and status."""
+    job = SettlementJob.objects.select_related("bundle", "initiated_by").get(pk=job_pk)
+    job = run_settlement_job(job, chunk_size=chunk_size, notify=notify)
+    return job.pk, job.status
+
+
+def run_settlement_job(
+    job, chunk_size=SETTLEMENT_CHUNK_SIZE, progress=None, notify=True
+):
+    """
+    Settle the purchases of a job in chunks, resuming from its checkpoint.
+
+    Each chunk is settled in its own transaction together with the job's
+    checkpoint and the participants' notifications, and only purchases
+    without a payout are selected, so running a job again never pays or
+    notifies a purchase twice.
+
+    Args:
+        job (SettlementJob): The job to run.
+        chunk_size (int): Number of purchases settled per transaction.
+        progress (callable): Optional callback receiving (settled, total).
+        notify (bool): Whether to email the participants.
+
+    Returns:
+        SettlementJob: The job with its final status.
+    """
+    if job.is_finished:
+        return job
+
+    settle_chunk, email_renderer = SETTLEMENT_HANDLERS[job.outcome]
+    renderer = email_renderer(job.bundle)
+    purchases = unsettled_purchases(job).select_related("user__wallet", "user__profile")
+
+    job.status = SettlementJob.Status.RUNNING
+    job.error = ""
+    job.total_purchases = job.settled_purchases + purchases.count()
+    job.save(update_fields=["status", "error", "total_purchases", "updated"])
+
+    try:
+        while True:
+            with transaction.atomic():
+                checkpoint = (
+                    SettlementJob.objects.select_for_update()
+                    .values_list("last_purchase_id", flat=True)
+                    .get(pk=job.pk)
+                )
+                chunk = list(
+                    purchases.filter(pk__gt=checkpoint)
+                    .select_for_update(of=("self",))
+                    .order_by("pk")[:chunk_size]
+                )
+                if not chunk:
+                    break
+
+                settle_chunk(job, chunk)
+                if notify:
+                    queue_notifications(renderer, chunk)
+
+                SettlementJob.objects.filter(pk=job.pk).update(
+                    last_purchase_id=chunk[-1].pk,
+                    settled_purchases=F("settled_purchases") + len(chunk),
+                    updated=timezone.now(),
+                )
+                job.last_purchase_id = chunk[-1].pk
+                job.settled_purchases += len(chunk)
+
+            logger.info(
+                f"Settled {job.settled_purchases}/{job.total_purchases} purchases for {job.bundle}."
+            )
+            if progress:
+                progress(job.settled_purchases, job.total_purchases)
+    except Exception as e:
+        logger.error(f"Error running settlement job {job.job_id}: {e}", exc_info=True)
+        job.status = SettlementJob.Status.FAILED
+        job.error = str(e)
+        job.save(update_fields=["status", "error", "updated"])
+        return job
+
+    job.status = SettlementJob.Status.COMPLETED
+    job.completed_at = timezone.now()
+    job.save(update_fields=["status", "completed_at", "updated"])
+    return job
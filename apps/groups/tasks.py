@@ -0,0 +1,14 @@
+"""Celery tasks for settling bundle outcomes."""
+
+from celery import shared_task
+
+from .models import SettlementJob
+from .settlement import run_settlement_job
+
+
+@shared_task
+def run_settlement_job_task(job_pk):
+    """Run or resume a settlement job."""
+    job = SettlementJob.objects.select_related("bundle", "initiated_by").get(pk=job_pk)
+    job = run_settlement_job(job)
+    return job.get_status_display()
@@ -6,13 +6,18 @@ from django.contrib.sites.shortcuts import get_current_site
 from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
-from django.utils.crypto import get_random_string
 
-from apps.core.utils import create_action, mk_paginator, send_email_thread
-from apps.wallets.models import AuditLog
+from apps.accounts.models import Action
+from apps.core.emails import BulkEmailRenderer
+from apps.core.utils import create_action, mk_paginator, queue_email, queue_emails
 
 from ..forms import BundleCreateForm, GroupCreateForm, GroupUpdateForm
-from ..models import Bundle, Group, GroupRequest, Payout, Purchase
+from ..models import Bundle, Group, GroupRequest, Purchase, SettlementJob
+from ..settlement import (
+    lock_unsettled_bundle,
+    settlement_progress,
+    start_settlement,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -228,7 +233,7 @@ def approve_group_request(request, request_id):
         },
     )
 
-    send_email_thread(
+    queue_email(
         subject,
         text_message,
         html_message,
@@ -282,7 +287,7 @@ def reject_group_request(request, request_id):
         },
     )
 
-    send_email_thread(
+    queue_email(
         subject,
         text_message,
         html_message,
@@ -382,119 +387,79 @@ def admin_bundles_detail(request, bundle_id):
         if new_status in dict(Bundle.Status.choices):
             # Handle Won scenario
             if new_status == Bundle.Status.WON:
-                bundle.status = new_status
-                bundle.round_outcomes[bundle.current_round] = Bundle.Status.WON
-                bundle.round_outcomes = dict(bundle.round_outcomes)
-                bundle.save()
-
-                # Process winnings for all participants
-                for purchase in bundle.purchases.filter(
-                    status=Purchase.Status.APPROVED
-                ):
-                    potential_win_amount = purchase.payout_amount
-
-                    try:
-                        # Credit user wallets
-                        wallet = purchase.user.wallet
-                        reference = get_random_string(length=12).upper()
-                        wallet.update_balance(
-                            potential_win_amount,
-                            transaction_type=AuditLog.TransactionType.BUNDLE_WINNING,
-                            transaction_id=reference,
-                        )
-
-                        # Create Payout object
-                        Payout.objects.create(
-                            user=purchase.user,
-                            bundle=bundle,
-                            amount=potential_win_amount,
-                        )
+                with transaction.atomic():
+                    locked = lock_unsettled_bundle(bundle)
+                    if locked is None:
+                        messages.error(request, "This bundle is already settled.")
+                        return redirect(bundle)
+                    bundle = locked
+                    bundle.status = new_status
+                    bundle.round_outcomes[bundle.current_round] = Bundle.Status.WON
+                    bundle.round_outcomes = dict(bundle.round_outcomes)
+                    bundle.save()
 
-                        # Send email notification
-                        email_context = {
-                            "user": purchase.user,
-                            "bundle": bundle,
-                            "amount": potential_win_amount,
-                        }
-                        subject = "Congratulations! Bundle Winning Payout"
-                        html_content = render_to_string(
-                            "accounts/bettor/bundles/email/payout.html",
-                            email_context,
-                        )
-                        text_content = render_to_string(
-                            "accounts/bettor/bundles/email/payout.txt",
-                            email_context,
-                        )
-                        send_email_thread(
-                            subject=subject,
-                            text_content=text_content,
-                            html_content=html_content,
-                            recipient_email=purchase.user.email,
-                            recipient_name=purchase.user.get_full_name(),
-                        )
+                    # Process winnings for all participants in the background
+                    start_settlement(bundle, SettlementJob.Outcome.WON, request.user)
 
-                        create_action(
-                            request.user,
-                            "Bundle Winning Payout",
-                            f"{purchase.user} has been paid their bundle wins.",
-                            target=purchase.user.profile,
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing payout for {purchase.user}: {e}"
-                        )
-                        messages.error(
-                            request,
-                            f"An error occurred while processing winnings for {purchase.user}.",
-                        )
-                        continue
+                messages.success(
+                    request,
+                    "Bundle marked as Won. Participants' winnings are being paid out.",
+                )
 
             # Handle Lost scenario
             elif new_status == Bundle.Status.LOST:
                 if bundle.current_round < Bundle.MAX_ROUNDS:
-                    # Move to the next round
-                    bundle.current_round += 1
-                    bundle.status = Bundle.Status.PENDING
-                    bundle.round_outcomes[bundle.current_round - 1] = Bundle.Status.LOST
-                    bundle.save()
-
-                    # Notify participants of the new round
-                    for participant in bundle.participants.all():
-                        try:
-                            email_context = {
-                                "user": participant,
-                                "bundle": bundle,
-                                "next_round": bundle.current_round,
-                            }
-                            subject = "Update: Bundle Progressing to a New Round"
-                            html_content = render_to_string(
-                                "accounts/bettor/bundles/email/round.html",
-                                email_context,
-                            )
-                            text_content = render_to_string(
-                                "accounts/bettor/bundles/email/round.txt",
-                                email_context,
+                    participants = list(bundle.participants.select_related("profile"))
+                    try:
+                        with transaction.atomic():
+                            locked = lock_unsettled_bundle(bundle)
+                            if locked is None:
+                                messages.error(
+                                    request, "This bundle is already settled."
+                                )
+                                return redirect(bundle)
+                            bundle = locked
+
+                            # Move to the next round
+                            bundle.current_round += 1
+                            bundle.status = Bundle.Status.PENDING
+                            bundle.round_outcomes[bundle.current_round - 1] = (
+                                Bundle.Status.LOST
                             )
-                            send_email_thread(
-                                subject=subject,
-                                text_content=text_content,
-                                html_content=html_content,
-                                recipient_email=participant.email,
-                                recipient_name=participant.get_full_name(),
+                            bundle.save()
+
+                            # The notification is rendered once and filled in per participant
+                            renderer = BulkEmailRenderer(
+                                "Update: Bundle Progressing to a New Round",
+                                "accounts/bettor/bundles/email/round",
+                                {"bundle": bundle, "next_round": bundle.current_round},
                             )
 
-                            create_action(
-                                request.user,
-                                "Bundle Status Update",
-                                f"Notified {participant} about the bundle moving to the next round.",
-                                target=participant.profile,
+                            # Notify participants of the new round
+                            queue_emails(
+                                [
+                                    renderer.render(participant)
+                                    for participant in participants
+                                ]
                             )
-                        except Exception as e:
-                            logger.error(f"Error sending email to {participant}: {e}")
-                            messages.error(
-                                request,
-                                f"An error occurred while notifying {participant}.",
+                            Action.objects.bulk_create(
+                                [
+                                    Action(
+                                        user=request.user,
+                                        title="Bundle Status Update",
+                                        verb=f"Notified {participant} about the bundle moving to the next round.",
+                                        target=participant.profile,
+                                    )
+                                    for participant in participants
+                                ]
                             )
+                    except Exception as e:
+                        logger.error(f"Error moving {bundle} to the next round: {e}")
+                        messages.error(
+                            request,
+                            "An error occurred while notifying participants. The bundle was not updated.",
+                        )
+                        return redirect(bundle)
 
                     messages.success(
                         request,
@@ -502,55 +467,20 @@ def admin_bundles_detail(request, bundle_id):
                     )
                 else:
                     # Final round, mark permanently lost
-                    bundle.status = Bundle.Status.LOST
-                    bundle.round_outcomes[bundle.current_round] = Bundle.Status.LOST
-                    bundle.save()
-
-                    # Notify participants of the final loss
-                    for purchase in bundle.purchases.filter(
-                        status=Purchase.Status.APPROVED
-                    ):
-                        try:
-                            Payout.objects.create(
-                                user=purchase.user,
-                                bundle=bundle,
-                                amount=0,
-                                status=Payout.Status.CANCELLED,
-                            )
-
-                            email_context = {"user": purchase.user, "bundle": bundle}
-                            subject = "Bundle Result: Lost"
-                            html_content = render_to_string(
-                                "accounts/bettor/bundles/email/lost.html",
-                                email_context,
-                            )
-                            text_content = render_to_string(
-                                "accounts/bettor/bundles/email/lost.txt",
-                                email_context,
-                            )
-                            send_email_thread(
-                                subject=subject,
-                                text_content=text_content,
-                                html_content=html_content,
-                                recipient_email=purchase.user.email,
-                                recipient_name=purchase.user.get_full_name(),
-                            )
-
-                            create_action(
-                                request.user,
-                                "Bundle Lost Notification",
-                                f"{purchase.user} has been notified of the lost bundle.",
-                                target=purchase.user.profile,
-                            )
-                        except Exception as e:
-                            logger.error(
-                                f"Error processing lost notification for {purchase.user}: {e}"
-                            )
-                            messages.error(
-                                request,
-                                f"An error occurred while notifying {purchase.user} about the lost bundle.",
-                            )
-                            continue
+                    with transaction.atomic():
+                        locked = lock_unsettled_bundle(bundle)
+                        if locked is None:
+                            messages.error(request, "This bundle is already settled.")
+                            return redirect(bundle)
+                        bundle = locked
+                        bundle.status = Bundle.Status.LOST
+                        bundle.round_outcomes[bundle.current_round] = Bundle.Status.LOST
+                        bundle.save()
+
+                        # Notify participants of the final loss in the background
+                        start_settlement(
+                            bundle, SettlementJob.Outcome.LOST, request.user
+                        )
 
                     messages.success(
                         request,
@@ -571,11 +501,15 @@ def admin_bundles_detail(request, bundle_id):
         else bundle.round_outcomes.get(bundle.current_round, Bundle.Status.PENDING)
     )
 
+    # Progress of the latest settlement of the bundle outcome, if any
+    settlement = settlement_progress(bundle)
+
     template = "bundles/detail.html"
     context = {
         "bundle": bundle,
         "approved_purchases": approved_purchases,
         "latest_outcome": latest_outcome,
+        "settlement": settlement,
     }
 
     return render(request, template, context)
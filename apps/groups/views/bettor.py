@@ -11,9 +11,10 @@ from django.contrib.auth.hashers import check_password
 from django.db import transaction
 
 from ..forms import BundlePurchaseForm
-from apps.core.utils import mk_paginator, create_action, send_email_thread
+from apps.core.utils import mk_paginator, create_action, queue_email
 from ..models import Bundle, Purchase, GroupRequest, Group
-from apps.wallets.models import Wallet
+from apps.wallets.models import AuditLog
+from apps.wallets.utils import get_user_wallet
 from apps.wallets.forms import TransactionPINForm
 import logging
 
@@ -137,7 +138,7 @@ def bettor_bundle_detail(request, bundle_id):
 @login_required
 def bettor_bundles_purchase(request, bundle_id):
     bundle = get_object_or_404(Bundle, bundle_id=bundle_id)
-    wallet = get_object_or_404(Wallet, user=request.user)
+    wallet = get_user_wallet(request)
 
     # Restrict purchase for bundles marked as WON or LOST
     if bundle.status in {Bundle.Status.WON, Bundle.Status.LOST}:
@@ -224,7 +225,7 @@ def bettor_bundle_purchase_pin(request):
         return redirect("bettor:dashboard")
 
     bundle = get_object_or_404(Bundle, bundle_id=purchase_data["bundle_id"])
-    wallet = get_object_or_404(Wallet, user=request.user)
+    wallet = get_user_wallet(request)
 
     # Restrict purchase for bundles marked as WON or LOST
     if bundle.status in {Bundle.Status.WON, Bundle.Status.LOST}:
@@ -253,13 +254,17 @@ def bettor_bundle_purchase_pin(request):
                         )
 
                         # Deduct amount from wallet
-                        if wallet.balance < total_amount:
+                        reference = get_random_string(length=12).upper()
+                        try:
+                            wallet.debit(
+                                total_amount,
+                                transaction_type=AuditLog.TransactionType.BUNDLE_PURCHASE,
+                                transaction_id=reference,
+                            )
+                        except ValueError:
                             messages.error(request, "Insufficient wallet balance.")
                             return redirect("bettor:wallet_deposit")
 
-                        wallet.balance -= total_amount
-                        wallet.save()
-
                         # Calculate the potential win (payout amount)
                         payout_amount_interest = total_amount * (
                             winning_percentage / 100
@@ -274,7 +279,7 @@ def bettor_bundle_purchase_pin(request):
                             amount=total_amount,
                             payout_amount=payout_amount,
                             status=Purchase.Status.APPROVED,
-                            reference=get_random_string(length=12).upper(),
+                            reference=reference,
                         )
 
                         # Add user as a participant
@@ -299,7 +304,7 @@ def bettor_bundle_purchase_pin(request):
                             "accounts/bettor/bundles/email/acknowledgment.txt",
                             email_context,
                         )
-                        send_email_thread(
+                        queue_email(
                             subject=subject,
                             text_content=text_content,
                             html_content=html_content,
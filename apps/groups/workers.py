@@ -0,0 +1,31 @@
+"""Setup of the worker processes that run settlement jobs in parallel."""
+
+
+def setup_settlement_worker(database_names):
+    """
+    Prepare a settlement worker process before it runs any job.
+
+    Under the spawn start method the worker is a fresh interpreter, so
+    Django is set up here, with the database names the parent used (a test
+    database, say). Under fork the worker inherits the parent's state, and
+    any connection it still holds is dropped so none is shared.
+
+    This module imports nothing from Django at load time, so the worker can
+    unpickle this initializer before Django is set up.
+
+    Args:
+        database_names (dict): Database NAME of each connection alias.
+    """
+    import django
+    from django.apps import apps
+    from django.conf import settings
+    from django.db import connections
+
+    if not apps.ready:
+        for alias, name in database_names.items():
+            settings.DATABASES[alias]["NAME"] = name
+        django.setup()
+    for connection in connections.all(initialized_only=True):
+        # Forgotten rather than closed: closing a forked connection would end
+        # the parent's session with the database.
+        connection.connection = None
@@ -1,6 +1,14 @@
 from django.contrib import admin
 
-from .models import Wallet, Deposit, AuditLog, Withdrawal
+from .models import (
+    Wallet,
+    Deposit,
+    AuditLog,
+    AuditLogRollup,
+    ReconciliationRun,
+    Withdrawal,
+    WalletSnapshot,
+)
 
 
 @admin.register(Wallet)
@@ -44,3 +52,37 @@ class WithdrawalAdmin(admin.ModelAdmin):
         "processed_at",
         "created",
     ]
+
+
+@admin.register(ReconciliationRun)
+class ReconciliationRunAdmin(admin.ModelAdmin):
+    list_display = [
+        "mode",
+        "wallets_checked",
+        "drifted_wallets",
+        "total_drift",
+        "created",
+        "completed_at",
+    ]
+
+
+@admin.register(WalletSnapshot)
+class WalletSnapshotAdmin(admin.ModelAdmin):
+    list_display = [
+        "wallet",
+        "date",
+        "closing_balance",
+    ]
+    list_filter = ["date"]
+
+
+@admin.register(AuditLogRollup)
+class AuditLogRollupAdmin(admin.ModelAdmin):
+    list_display = [
+        "wallet",
+        "month",
+        "credits",
+        "debits",
+        "entries",
+    ]
+    list_filter = ["month"]
@@ -0,0 +1,233 @@
+"""Archival of closed months of audit logs to compressed files."""
+
+import csv
+import gzip
+import logging
+import os
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogRollup
+from .snapshots import build_snapshots
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_CHUNK_SIZE = 5000
+PARTITION_MONTHS_AHEAD = 3
+
+ARCHIVE_COLUMNS = [
+    "id",
+    "audit_id",
+    "wallet_id",
+    "transaction_type",
+    "transaction_id",
+    "amount",
+    "balance_before",
+    "balance_after",
+    "created",
+    "updated",
+]
+
+
+def month_start(year, month):
+    """Return the aware datetime a month starts at, allowing month overflow."""
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return timezone.make_aware(datetime(year, month, 1))
+
+
+def partition_name(month):
+    return f"{AuditLog._meta.db_table}_p{month:%Y%m}"
+
+
+def is_partitioned():
+    """Whether the audit log table is partitioned by month on PostgreSQL."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [AuditLog._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+def ensure_partitions(months_ahead=PARTITION_MONTHS_AHEAD):
+    """
+    Create the monthly partitions of the current and upcoming months, so
+    new audit logs never land in the default partition.
+
+    Returns:
+        list: Names of the partitions created.
+    """
+    if not is_partitioned():
+        return []
+
+    now = timezone.localtime()
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            start = month_start(now.year, now.month + offset)
+            end = month_start(now.year, now.month + offset + 1)
+            name = partition_name(start)
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            if cursor.fetchone()[0] is None:
+                cursor.execute(
+                    f"CREATE TABLE {name} PARTITION OF {AuditLog._meta.db_table} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [start, end],
+                )
+                created.append(name)
+    return created
+
+
+def closed_months(retention_months=None):
+    """Return the start of every month with audit logs older than retention."""
+    if retention_months is None:
+        retention_months = settings.AUDITLOG_RETENTION_MONTHS
+    now = timezone.localtime()
+    cutoff = month_start(now.year, now.month - retention_months)
+    return [
+        timezone.localtime(month)
+        for month in AuditLog.objects.filter(created__lt=cutoff)
+        .annotate(month=TruncMonth("created"))
+        .values_list("month", flat=True)
+        .distinct()
+        .order_by("month")
+    ]
+
+
+def export_month(audit_logs, path, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """Stream audit logs into a gzip-compressed CSV file, returning the row count."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = 0
+    with gzip.open(path, "wt", newline="") as archive:
+        writer = csv.writer(archive)
+        writer.writerow(ARCHIVE_COLUMNS)
+        for row in (
+            audit_logs.order_by("pk")
+            .values_list(*ARCHIVE_COLUMNS)
+            .iterator(chunk_size=chunk_size)
+        ):
+            writer.writerow(row)
+            rows += 1
+    return rows
+
+
+def archive_path(directory, start):
+    """
+    Return the file a month is archived to. A month archived again, for
+    audit logs that arrived after it was archived, gets a numbered file
+    rather than replacing the earlier one.
+    """
+    path = os.path.join(directory, f"auditlog-{start:%Y-%m}.csv.gz")
+    part = 1
+    while os.path.exists(path):
+        part += 1
+        path = os.path.join(directory, f"auditlog-{start:%Y-%m}.{part}.csv.gz")
+    return path
+
+
+def rollup_totals(month, totals):
+    """Add per-wallet totals to the rollups of a month, creating missing ones."""
+    totals = {total.pop("wallet_id"): total for total in totals}
+    existing = AuditLogRollup.objects.select_for_update().filter(
+        month=month, wallet_id__in=totals
+    )
+    updated = []
+    for rollup in existing:
+        total = totals.pop(rollup.wallet_id)
+        rollup.credits += total["credits"]
+        rollup.debits += total["debits"]
+        rollup.entries += total["entries"]
+        rollup.updated = timezone.now()
+        updated.append(rollup)
+    AuditLogRollup.objects.bulk_update(
+        updated,
+        ["credits", "debits", "entries", "updated"],
+        batch_size=ARCHIVE_CHUNK_SIZE,
+    )
+    AuditLogRollup.objects.bulk_create(
+        [
+            AuditLogRollup(month=month, wallet_id=wallet_id, **total)
+            for wallet_id, total in totals.items()
+        ],
+        batch_size=ARCHIVE_CHUNK_SIZE,
+    )
+
+
+def archive_month(month, directory=None):
+    """
+    Move one month of audit logs to a compressed CSV file.
+
+    The month is exported first and its wallet snapshots are built, so
+    Wallet.balance_on keeps working without the rows. Its per-wallet totals
+    are then added to AuditLogRollup and the rows are removed in the same
+    transaction, so a run that stops part way can simply be repeated. The
+    archive file only takes its final name once that transaction commits,
+    and a month archived again is added to its rollups and written to a
+    new file. On a partitioned table the month's partition is detached and
+    dropped instead of deleting its rows.
+
+    Args:
+        month (datetime): Start of the month, in the current time zone.
+        directory (str): Directory of the archive files.
+
+    Returns:
+        int: Number of audit logs archived.
+    """
+    directory = directory or settings.AUDITLOG_ARCHIVE_DIR
+    start = month_start(month.year, month.month)
+    end = month_start(month.year, month.month + 1)
+    audit_logs = AuditLog.objects.filter(created__gte=start, created__lt=end)
+
+    path = archive_path(directory, start)
+    partial = f"{path}.partial"
+    rows = export_month(audit_logs, partial)
+    build_snapshots(start.date(), (end - timedelta(days=1)).date())
+
+    amount = DecimalField(max_digits=14, decimal_places=2)
+    debit = Q(transaction_type__in=AuditLog.DEBIT_TYPES)
+    totals = (
+        audit_logs.order_by()
+        .values("wallet_id")
+        .annotate(
+            credits=Coalesce(
+                Sum("amount", filter=~debit), Value(0), output_field=amount
+            ),
+            debits=Coalesce(Sum("amount", filter=debit), Value(0), output_field=amount),
+            entries=Count("pk"),
+        )
+    )
+
+    try:
+        with transaction.atomic():
+            rollup_totals(start.date(), totals)
+            drop_month(start, audit_logs)
+    except Exception:
+        os.remove(partial)
+        raise
+    os.replace(partial, path)
+
+    logger.info(f"Archived {rows} audit logs of {start:%B %Y} to {path}.")
+    return rows
+
+
+def drop_month(start, audit_logs):
+    """Remove the audit logs of a month that were archived."""
+    if is_partitioned():
+        name = partition_name(start)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            if cursor.fetchone()[0] is not None:
+                cursor.execute(
+                    f"ALTER TABLE {AuditLog._meta.db_table} DETACH PARTITION {name}"
+                )
+                cursor.execute(f"DROP TABLE {name}")
+    # Rows of the month left in the default partition, or the whole
+    # month when the table is not partitioned.
+    audit_logs.delete()
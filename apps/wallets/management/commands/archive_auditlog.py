@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.wallets.archive import (
+    PARTITION_MONTHS_AHEAD,
+    archive_month,
+    closed_months,
+    ensure_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move audit logs of months older than AUDITLOG_RETENTION_MONTHS to "
+        "compressed CSV files, keeping per-wallet totals in AuditLogRollup. "
+        "On PostgreSQL it also creates the monthly partitions of the coming "
+        "months, so it should run at least once a month."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=settings.AUDITLOG_RETENTION_MONTHS,
+            help="Number of whole months of audit logs kept in the database.",
+        )
+        parser.add_argument(
+            "--directory",
+            default=settings.AUDITLOG_ARCHIVE_DIR,
+            help="Directory the archive files are written to.",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=PARTITION_MONTHS_AHEAD,
+            help="Number of upcoming months to create partitions for.",
+        )
+
+    def handle(self, *args, **options):
+        for name in ensure_partitions(options["months_ahead"]):
+            self.stdout.write(f"Created partition {name}.")
+
+        months = closed_months(options["retention_months"])
+        if not months:
+            self.stdout.write("No audit logs to archive.")
+            return
+
+        for month in months:
+            rows = archive_month(month, directory=options["directory"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Archived {rows} audit logs of {month:%B %Y}.")
+            )
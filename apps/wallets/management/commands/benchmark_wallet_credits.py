@@ -0,0 +1,116 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.wallets.models import AuditLog, Wallet
+
+User = get_user_model()
+
+CREDIT_AMOUNT = Decimal("10.00")
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark fixture."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the queries and time of crediting wallets one by one with "
+        "Wallet.update_balance against a single Wallet.objects.bulk_apply call. "
+        "Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wallets",
+            type=int,
+            default=1000,
+            help="Number of wallets credited.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                wallets = self.create_fixture(options["wallets"])
+
+                self.measure(
+                    "Wallet.update_balance",
+                    len(wallets),
+                    lambda: [
+                        wallet.update_balance(
+                            CREDIT_AMOUNT,
+                            transaction_type=AuditLog.TransactionType.WALLET_DEPOSIT,
+                            transaction_id=f"BENCH{wallet.pk}",
+                        )
+                        for wallet in wallets
+                    ],
+                )
+                self.measure(
+                    "Wallet.objects.bulk_apply",
+                    len(wallets),
+                    lambda: Wallet.objects.bulk_apply(
+                        [
+                            (
+                                wallet.pk,
+                                CREDIT_AMOUNT,
+                                AuditLog.TransactionType.WALLET_DEPOSIT,
+                                f"BULK{wallet.pk}",
+                            )
+                            for wallet in wallets
+                        ]
+                    ),
+                )
+                self.measure(
+                    "Wallet.objects.bulk_apply (credit and debit)",
+                    len(wallets) * 2,
+                    lambda: Wallet.objects.bulk_apply(
+                        [
+                            entry
+                            for wallet in wallets
+                            for entry in (
+                                (
+                                    wallet.pk,
+                                    CREDIT_AMOUNT,
+                                    AuditLog.TransactionType.WALLET_DEPOSIT,
+                                    f"MIXC{wallet.pk}",
+                                ),
+                                (
+                                    wallet.pk,
+                                    -CREDIT_AMOUNT,
+                                    AuditLog.TransactionType.WALLET_WITHDRAWAL,
+                                    f"MIXD{wallet.pk}",
+                                ),
+                            )
+                        ]
+                    ),
+                )
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_fixture(self, count):
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"wallet-benchmark-{index}",
+                    email=f"wallet-benchmark-{index}@example.com",
+                )
+                for index in range(count)
+            ]
+        )
+        return Wallet.objects.bulk_create([Wallet(user=user) for user in users])
+
+    def measure(self, label, count, credit):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            credit()
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{label}: {count} entries, {len(queries)} queries "
+            f"({len(queries) / count:.2f} per entry) in {elapsed * 1000:.1f}ms"
+        )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from apps.wallets.reconciliation import RECONCILIATION_CHUNK_SIZE, reconcile_wallets
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that every wallet balance equals the sum of its audit logs and "
+        "report the wallets that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only check the wallets touched since the last completed run.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=RECONCILIATION_CHUNK_SIZE,
+            help="Number of wallets fetched per round trip.",
+        )
+
+    def handle(self, *args, **options):
+        run = reconcile_wallets(
+            incremental=options["incremental"],
+            chunk_size=options["chunk_size"],
+            report=self.report,
+        )
+        summary = (
+            f"{run.get_mode_display()} run checked {run.wallets_checked} wallets: "
+            f"{run.drifted_wallets} drifted by {run.total_drift} in total."
+        )
+        if run.drifted_wallets:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def report(self, wallet_pk, email, balance, expected):
+        self.stdout.write(
+            f"Wallet {wallet_pk} ({email}): balance {balance}, "
+            f"audit logs {expected}, drift {balance - expected}"
+        )
@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.wallets.models import AuditLog
+from apps.wallets.snapshots import build_snapshots, next_snapshot_date
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the closing balance of every wallet with transactions for each "
+        "day since the last snapshot, up to yesterday. Meant to run nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=date.fromisoformat,
+            help="Only (re)build the snapshots of this day (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Rebuild every day since the first audit log.",
+        )
+
+    def handle(self, *args, **options):
+        end = timezone.localdate() - timedelta(days=1)
+        if options["date"] and options["backfill"]:
+            raise CommandError("--date and --backfill cannot be used together.")
+
+        if options["date"]:
+            start = end = options["date"]
+        elif options["backfill"]:
+            first = AuditLog.objects.order_by("created").first()
+            start = timezone.localdate(first.created) if first else None
+        else:
+            start = next_snapshot_date()
+
+        if start is None or start > end:
+            self.stdout.write("Wallet snapshots are up to date.")
+            return
+
+        written = build_snapshots(start, end)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {written} wallet snapshots from {start} to {end}."
+            )
+        )
@@ -0,0 +1,87 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:09
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wallets", "0004_auditlog_wallets_aud_wallet__ca9400_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReconciliationRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "run_id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    "mode",
+                    models.CharField(
+                        choices=[("F", "Full"), ("I", "Incremental")],
+                        default="F",
+                        help_text="Whether every wallet or only recently touched ones were checked.",
+                        max_length=1,
+                        verbose_name="Mode",
+                    ),
+                ),
+                (
+                    "last_audit_log_id",
+                    models.PositiveBigIntegerField(
+                        default=0,
+                        help_text="Highest audit log primary key covered by this run.",
+                        verbose_name="Last Audit Log ID",
+                    ),
+                ),
+                (
+                    "wallets_checked",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Wallets Checked"
+                    ),
+                ),
+                (
+                    "drifted_wallets",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Wallets whose balance differs from their audit logs.",
+                        verbose_name="Drifted Wallets",
+                    ),
+                ),
+                (
+                    "total_drift",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Sum of the absolute differences found.",
+                        max_digits=14,
+                        verbose_name="Total Drift",
+                    ),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Completed At"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Reconciliation Run",
+                "verbose_name_plural": "Reconciliation Runs",
+                "ordering": ["-created"],
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wallets", "0005_reconciliationrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WalletSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "date",
+                    models.DateField(
+                        help_text="Day the closing balance applies to.",
+                        verbose_name="Date",
+                    ),
+                ),
+                (
+                    "closing_balance",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Wallet balance at the end of the day.",
+                        max_digits=12,
+                        verbose_name="Closing Balance",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Wallet Snapshot",
+                "verbose_name_plural": "Wallet Snapshots",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["wallet", "created"], name="wallets_aud_wallet__96998e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["created"], name="wallets_aud_created_a5f9a1_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="walletsnapshot",
+            name="wallet",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="snapshots",
+                to="wallets.wallet",
+                verbose_name="Wallet",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="walletsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("wallet", "date"), name="unique_wallet_snapshot_per_day"
+            ),
+        ),
+    ]
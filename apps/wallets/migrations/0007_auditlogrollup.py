@@ -0,0 +1,85 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:11
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wallets", "0006_walletsnapshot_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditLogRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "month",
+                    models.DateField(
+                        help_text="First day of the archived month.",
+                        verbose_name="Month",
+                    ),
+                ),
+                (
+                    "credits",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total amount credited during the month.",
+                        max_digits=14,
+                        verbose_name="Credits",
+                    ),
+                ),
+                (
+                    "debits",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Total amount debited during the month.",
+                        max_digits=14,
+                        verbose_name="Debits",
+                    ),
+                ),
+                (
+                    "entries",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of audit logs archived.",
+                        verbose_name="Entries",
+                    ),
+                ),
+                (
+                    "wallet",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="audit_rollups",
+                        to="wallets.wallet",
+                        verbose_name="Wallet",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Audit Log Rollup",
+                "verbose_name_plural": "Audit Log Rollups",
+                "ordering": ["-month"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("wallet", "month"),
+                        name="unique_audit_log_rollup_per_month",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Converts wallets_auditlog into a table range-partitioned by month of
+# "created" on PostgreSQL. Other databases keep a regular table.
+
+from datetime import datetime
+
+from django.db import migrations
+from django.utils import timezone
+
+TABLE = "wallets_auditlog"
+OLD_TABLE = "wallets_auditlog_unpartitioned"
+MONTHS_AHEAD = 3
+
+
+def month_start(year, month):
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return timezone.make_aware(datetime(year, month, 1))
+
+
+def partition_auditlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, TABLE)
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created)"
+        )
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+        cursor.execute(f"SELECT MIN(created) FROM {OLD_TABLE}")
+        (first,) = cursor.fetchone()
+        first = timezone.localtime(first or timezone.now())
+        now = timezone.localtime()
+        months = (now.year - first.year) * 12 + now.month - first.month + MONTHS_AHEAD
+        for offset in range(months + 1):
+            start = month_start(first.year, first.month + offset)
+            end = month_start(first.year, first.month + offset + 1)
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{start:%Y%m} PARTITION OF {TABLE} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {OLD_TABLE}")
+        cursor.execute(f"DROP TABLE {OLD_TABLE}")
+
+        # The identity column does not carry over, so use an owned sequence.
+        cursor.execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')"
+        )
+        cursor.execute(
+            f"SELECT setval('{TABLE}_id_seq', COALESCE(MAX(id), 0) + 1, false) "
+            f"FROM {TABLE}"
+        )
+
+        # Unique constraints of a partitioned table must include the
+        # partition key, so "created" is added to them.
+        for name, constraint in constraints.items():
+            columns = constraint["columns"]
+            if constraint["primary_key"] or constraint["unique"]:
+                kind = "PRIMARY KEY" if constraint["primary_key"] else "UNIQUE"
+                columns = ", ".join(dict.fromkeys([*columns, "created"]))
+                cursor.execute(
+                    f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {kind} ({columns})"
+                )
+            elif constraint["foreign_key"]:
+                table, column = constraint["foreign_key"]
+                cursor.execute(
+                    f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} "
+                    f"FOREIGN KEY ({columns[0]}) REFERENCES {table} ({column}) "
+                    "DEFERRABLE INITIALLY DEFERRED"
+                )
+            elif constraint["index"]:
+                cursor.execute(f"CREATE INDEX {name} ON {TABLE} ({', '.join(columns)})")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wallets", "0007_auditlogrollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_auditlog, migrations.RunPython.noop),
+    ]
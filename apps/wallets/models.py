@@ -1,3 +1,5 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
 from decimal import Decimal
 import uuid
 
@@ -7,8 +9,8 @@ from django.core.validators import (
     MinLengthValidator,
     MinValueValidator,
 )
-from django.db import models, transaction
-from django.db.models import F
+from django.db import connection, models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -22,6 +24,166 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+class WalletManager(models.Manager):
+    # Wallets changed per UPDATE statement, keeping bulk changes within the
+    # query parameter limits of every backend.
+    BALANCE_BATCH_SIZE = 1000
+
+    def bulk_apply(self, entries):
+        """
+        Applies many credits and debits in one transaction and logs each one.
+
+        The balances are changed with one set-based UPDATE ... RETURNING per
+        batch of wallets and the audit logs are inserted with multi-row
+        INSERTs, carrying the running balance of each wallet in the order
+        the entries are given.
+
+        Args:
+            entries (list): (wallet pk, amount, transaction type, transaction
+                id) tuples. Positive amounts credit the wallet and negative
+                amounts debit it.
+
+        Returns:
+            dict: The new balance of each wallet, keyed by wallet pk.
+
+        Raises:
+            ValueError: If an amount is zero, a wallet does not exist or an
+                entry would overdraw its wallet, in which case no entry is
+                applied.
+        """
+        entries = [
+            (wallet_pk, _to_balance(amount), transaction_type, transaction_id)
+            for wallet_pk, amount, transaction_type, transaction_id in entries
+        ]
+        if not entries:
+            return {}
+        if any(entry[1] == Decimal("0.00") for entry in entries):
+            raise ValueError("Transaction amount must not be zero.")
+
+        totals = defaultdict(Decimal)
+        for wallet_pk, amount, transaction_type, transaction_id in entries:
+            totals[wallet_pk] += amount
+
+        with transaction.atomic():
+            new_balances = self._add_to_balances(totals)
+            missing = totals.keys() - new_balances.keys()
+            if missing:
+                raise ValueError(f"Wallets do not exist: {sorted(missing)}")
+
+            # Walk each wallet's entries forward from its balance before the UPDATE.
+            balances = {pk: new_balances[pk] - total for pk, total in totals.items()}
+
+            rows = []
+            for wallet_pk, amount, transaction_type, transaction_id in entries:
+                balance_before = balances[wallet_pk]
+                balances[wallet_pk] = balance_before + amount
+                if balances[wallet_pk] < Decimal("0.00"):
+                    raise ValueError("Insufficient wallet balance.")
+                rows.append(
+                    (
+                        wallet_pk,
+                        transaction_type,
+                        transaction_id,
+                        abs(amount),
+                        balance_before,
+                        balances[wallet_pk],
+                    )
+                )
+            self._insert_audit_logs(rows)
+
+        return new_balances
+
+    def _add_to_balances(self, deltas):
+        """
+        Adds an amount to the balance of each wallet and returns the new
+        balances keyed by wallet pk.
+
+        On PostgreSQL the amounts are joined in from a VALUES list; other
+        backends use a CASE expression.
+        """
+        now = _db_value(Wallet, "updated", timezone.now())
+        table = Wallet._meta.db_table
+        items = list(deltas.items())
+        balances = {}
+
+        for start in range(0, len(items), self.BALANCE_BATCH_SIZE):
+            batch = items[start : start + self.BALANCE_BATCH_SIZE]
+            amounts = [_db_value(Wallet, "balance", delta) for pk, delta in batch]
+
+            if connection.vendor == "postgresql":
+                values = ", ".join(["(%s::bigint, %s::numeric)"] * len(batch))
+                sql = (
+                    f"UPDATE {table} AS wallet "
+                    "SET balance = wallet.balance + changes.delta, updated = %s "
+                    f"FROM (VALUES {values}) AS changes (id, delta) "
+                    "WHERE wallet.id = changes.id RETURNING wallet.id, wallet.balance"
+                )
+                params = [now]
+                for (pk, delta), amount in zip(batch, amounts):
+                    params += [pk, amount]
+            else:
+                whens = " ".join(["WHEN %s THEN %s"] * len(batch))
+                placeholders = ", ".join(["%s"] * len(batch))
+                sql = (
+                    f"UPDATE {table} SET balance = balance + CASE id {whens} END, "
+                    f"updated = %s WHERE id IN ({placeholders}) RETURNING id, balance"
+                )
+                params = []
+                for (pk, delta), amount in zip(batch, amounts):
+                    params += [pk, amount]
+                params += [now] + [pk for pk, delta in batch]
+
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                balances.update(
+                    (pk, _to_balance(balance)) for pk, balance in cursor.fetchall()
+                )
+
+        return balances
+
+    def _insert_audit_logs(self, rows):
+        """
+        Inserts audit logs from (wallet pk, transaction type, transaction id,
+        amount, balance before, balance after) tuples.
+
+        The rows are written with raw multi-row INSERTs, which avoids building
+        and preparing a model instance for each of them.
+        """
+        now = _db_value(AuditLog, "created", timezone.now())
+        audit_id = AuditLog._meta.get_field("audit_id")
+        columns = [
+            "audit_id",
+            "wallet_id",
+            "transaction_type",
+            "transaction_id",
+            "amount",
+            "balance_before",
+            "balance_after",
+            "created",
+            "updated",
+        ]
+        batch_size = self.BALANCE_BATCH_SIZE
+        if connection.features.max_query_params:
+            batch_size = min(
+                batch_size, connection.features.max_query_params // len(columns)
+            )
+        row_sql = "(" + ", ".join(["%s"] * len(columns)) + ")"
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start : start + batch_size]
+                params = []
+                for row in batch:
+                    params.append(audit_id.get_db_prep_value(uuid.uuid4(), connection))
+                    params += row
+                    params += [now, now]
+                cursor.execute(
+                    f"INSERT INTO {AuditLog._meta.db_table} ({', '.join(columns)}) "
+                    f"VALUES {', '.join([row_sql] * len(batch))}",
+                    params,
+                )
+
+
 class Wallet(TimeStampedModel):
     """Represents a user's wallet, tracking their balance."""
 
@@ -44,6 +206,8 @@ class Wallet(TimeStampedModel):
         help_text=_("Current wallet balance."),
     )
 
+    objects = WalletManager()
+
     class Meta:
         ordering = ["-created"]
         verbose_name = _("Wallet")
@@ -64,33 +228,178 @@ class Wallet(TimeStampedModel):
         """
         Safely updates the wallet balance and logs the transaction.
 
+        The new balance is returned by the UPDATE itself, so no extra query
+        is needed to read it back.
+
         Args:
             amount (Decimal): The amount to update the balance by.
             transaction_type (str): Type of the transaction.
             transaction_id (str): Unique identifier for the transaction.
+
+        Raises:
+            ValueError: If the amount is not positive.
+            Wallet.DoesNotExist: If the wallet row no longer exists.
         """
         if amount <= Decimal("0.00"):
             raise ValueError("Transaction amount must be positive.")
 
         with transaction.atomic():
-            fields_to_update = ["balance", "updated"]
-            balance_before = self.balance
+            balance_after = self._change_balance(
+                amount,
+                transaction_type=transaction_type,
+                transaction_id=transaction_id,
+            )
+        if balance_after is None:
+            raise Wallet.DoesNotExist(f"Wallet {self.pk} no longer exists.")
+
+        self.balance = balance_after
+
+    def debit(
+        self,
+        amount: Decimal,
+        transaction_type: str,
+        transaction_id: str,
+    ) -> Decimal:
+        """
+        Debits the wallet if it holds enough funds and logs the transaction.
 
-            Wallet.objects.filter(pk=self.pk).update(balance=F("balance") + amount)
-            # Ensure latest value is fetched.
-            self.refresh_from_db(fields=fields_to_update)
+        The balance check and the deduction are a single conditional UPDATE,
+        so concurrent debits and credits can never overdraw the wallet or
+        overwrite each other.
 
-            balance_after = self.balance
+        Args:
+            amount (Decimal): The amount to deduct from the balance.
+            transaction_type (str): Type of the transaction.
+            transaction_id (str): Unique identifier for the transaction.
 
-            # Create audit log
-            AuditLog.objects.create(
-                wallet=self,
+        Returns:
+            Decimal: The wallet balance after the debit.
+
+        Raises:
+            ValueError: If the amount is not positive or the wallet balance
+                is insufficient.
+        """
+        if amount <= Decimal("0.00"):
+            raise ValueError("Transaction amount must be positive.")
+
+        with transaction.atomic():
+            balance_after = self._change_balance(
+                -amount,
                 transaction_type=transaction_type,
                 transaction_id=transaction_id,
-                amount=amount,
-                balance_before=balance_before,
-                balance_after=balance_after,
             )
+        if balance_after is None:
+            raise ValueError("Insufficient wallet balance.")
+
+        self.balance = balance_after
+        return balance_after
+
+    def balance_on(self, date) -> Decimal:
+        """
+        Returns the wallet balance at the end of a day.
+
+        The latest snapshot on or before the day is read, and only the audit
+        logs after it are consulted, so the cost does not grow with the age
+        of the wallet.
+
+        Args:
+            date (date): The day, in the current time zone.
+        """
+        snapshot = self.snapshots.filter(date__lte=date).order_by("-date").first()
+        audit_logs = self.audit_logs.filter(created__lt=start_of_day(date, days=1))
+        if snapshot:
+            audit_logs = audit_logs.filter(
+                created__gte=start_of_day(snapshot.date, days=1)
+            )
+        last = audit_logs.order_by("-created", "-pk").first()
+        if last:
+            return last.balance_after
+        return snapshot.closing_balance if snapshot else Decimal("0.00")
+
+    def _change_balance(self, delta, transaction_type, transaction_id):
+        """
+        Applies a credit, or a debit that must not overdraw the wallet, and
+        writes its audit log. Returns the new balance, or None if the wallet
+        could not cover a debit or no longer exists.
+
+        On PostgreSQL the UPDATE and the audit log INSERT are a single
+        statement; other backends use UPDATE ... RETURNING and a separate
+        INSERT in the caller's transaction.
+        """
+        now = timezone.now()
+        amount = abs(delta)
+        update_sql = (
+            f"UPDATE {Wallet._meta.db_table} SET balance = balance + %s, updated = %s "
+            "WHERE id = %s"
+        )
+        update_params = [
+            _db_value(Wallet, "balance", delta),
+            _db_value(Wallet, "updated", now),
+            self.pk,
+        ]
+        if delta < 0:
+            # Only debits are checked, so a credit always lands.
+            update_sql += " AND balance + %s >= 0"
+            update_params.append(_db_value(Wallet, "balance", delta))
+        update_sql += " RETURNING balance"
+
+        if connection.vendor == "postgresql":
+            audit_log_sql = (
+                f"WITH changed AS ({update_sql}) "
+                f"INSERT INTO {AuditLog._meta.db_table} (created, updated, audit_id, "
+                "wallet_id, transaction_type, transaction_id, amount, "
+                "balance_before, balance_after) "
+                "SELECT %s, %s, %s, %s, %s, %s, %s, balance - %s, balance FROM changed "
+                "RETURNING balance_after"
+            )
+            audit_log_params = [
+                _db_value(AuditLog, "created", now),
+                _db_value(AuditLog, "updated", now),
+                _db_value(AuditLog, "audit_id", uuid.uuid4()),
+                self.pk,
+                transaction_type,
+                transaction_id,
+                _db_value(AuditLog, "amount", amount),
+                _db_value(Wallet, "balance", delta),
+            ]
+            with connection.cursor() as cursor:
+                cursor.execute(audit_log_sql, update_params + audit_log_params)
+                row = cursor.fetchone()
+            return _to_balance(row[0]) if row else None
+
+        with connection.cursor() as cursor:
+            cursor.execute(update_sql, update_params)
+            row = cursor.fetchone()
+        if row is None:
+            return None
+
+        balance_after = _to_balance(row[0])
+        AuditLog.objects.create(
+            wallet=self,
+            transaction_type=transaction_type,
+            transaction_id=transaction_id,
+            amount=amount,
+            balance_before=balance_after - delta,
+            balance_after=balance_after,
+        )
+        return balance_after
+
+
+def start_of_day(date, days=0):
+    """Return the aware datetime a day starts at, optionally days later."""
+    return timezone.make_aware(
+        datetime.combine(date + timedelta(days=days), datetime.min.time())
+    )
+
+
+def _db_value(model, field_name, value):
+    """Prepare a value for a raw query the way the model field would."""
+    return model._meta.get_field(field_name).get_db_prep_save(value, connection)
+
+
+def _to_balance(value):
+    """Convert a balance returned by a raw query to a two-place Decimal."""
+    return Decimal(str(value)).quantize(Decimal("0.01"))
 
 
 class AuditLog(TimeStampedModel):
@@ -103,6 +412,9 @@ class AuditLog(TimeStampedModel):
         BUNDLE_PURCHASE = "BP", _("Bundle Purchase")
         BUNDLE_WINNING = "BW", _("Bundle Winning")
 
+    # Transaction types whose amount is taken out of the wallet.
+    DEBIT_TYPES = [TransactionType.WALLET_WITHDRAWAL, TransactionType.BUNDLE_PURCHASE]
+
     audit_id = models.UUIDField(
         default=uuid.uuid4,
         unique=True,
@@ -151,12 +463,65 @@ class AuditLog(TimeStampedModel):
         indexes = [
             models.Index(fields=["wallet"]),
             models.Index(fields=["transaction_type"]),
+            models.Index(fields=["wallet", "created"]),
+            models.Index(fields=["created"]),
         ]
 
     def __str__(self):
         return f"Audit Log: {self.get_transaction_type_display()} - Amount: {self.amount} ({self.created})"
 
 
+class AuditLogRollup(TimeStampedModel):
+    """
+    Keeps the per-wallet totals of a month of audit logs that was archived,
+    so balances can still be reconciled after the rows are removed.
+    """
+
+    wallet = models.ForeignKey(
+        "Wallet",
+        on_delete=models.PROTECT,
+        related_name="audit_rollups",
+        verbose_name=_("Wallet"),
+    )
+    month = models.DateField(
+        _("Month"),
+        help_text=_("First day of the archived month."),
+    )
+    credits = models.DecimalField(
+        _("Credits"),
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        help_text=_("Total amount credited during the month."),
+    )
+    debits = models.DecimalField(
+        _("Debits"),
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        help_text=_("Total amount debited during the month."),
+    )
+    entries = models.PositiveIntegerField(
+        _("Entries"),
+        default=0,
+        help_text=_("Number of audit logs archived."),
+    )
+
+    class Meta:
+        ordering = ["-month"]
+        verbose_name = _("Audit Log Rollup")
+        verbose_name_plural = _("Audit Log Rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["wallet", "month"],
+                name="unique_audit_log_rollup_per_month",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Audit Log Rollup: {self.wallet} ({self.month:%B %Y})"
+
+
 class Deposit(TimeStampedModel):
     """Tracks each deposit transaction made to a user's wallet."""
 
@@ -351,3 +716,104 @@ class Withdrawal(TimeStampedModel):
 
     def __str__(self):
         return f"Withdrawal {self.reference} - ₦{self.amount} ({self.get_status_display()})"
+
+
+class ReconciliationRun(TimeStampedModel):
+    """
+    Records a check of wallet balances against the sum of their audit logs.
+
+    Each run keeps the highest audit log primary key it covered, so an
+    incremental run only re-checks the wallets touched since the last
+    completed run.
+    """
+
+    class Mode(models.TextChoices):
+        FULL = "F", _("Full")
+        INCREMENTAL = "I", _("Incremental")
+
+    run_id = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+    )
+    mode = models.CharField(
+        _("Mode"),
+        max_length=1,
+        choices=Mode.choices,
+        default=Mode.FULL,
+        help_text=_("Whether every wallet or only recently touched ones were checked."),
+    )
+    last_audit_log_id = models.PositiveBigIntegerField(
+        _("Last Audit Log ID"),
+        default=0,
+        help_text=_("Highest audit log primary key covered by this run."),
+    )
+    wallets_checked = models.PositiveIntegerField(
+        _("Wallets Checked"),
+        default=0,
+    )
+    drifted_wallets = models.PositiveIntegerField(
+        _("Drifted Wallets"),
+        default=0,
+        help_text=_("Wallets whose balance differs from their audit logs."),
+    )
+    total_drift = models.DecimalField(
+        _("Total Drift"),
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        help_text=_("Sum of the absolute differences found."),
+    )
+    completed_at = models.DateTimeField(
+        _("Completed At"),
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        ordering = ["-created"]
+        verbose_name = _("Reconciliation Run")
+        verbose_name_plural = _("Reconciliation Runs")
+
+    def __str__(self):
+        return f"Reconciliation: {self.get_mode_display()} - {self.drifted_wallets} drifted ({self.created})"
+
+
+class WalletSnapshot(TimeStampedModel):
+    """
+    Stores the closing balance of a wallet on a day it had transactions.
+
+    Days without transactions have no snapshot, as the closing balance of
+    the previous snapshot still applies.
+    """
+
+    wallet = models.ForeignKey(
+        "Wallet",
+        on_delete=models.CASCADE,
+        related_name="snapshots",
+        verbose_name=_("Wallet"),
+    )
+    date = models.DateField(
+        _("Date"),
+        help_text=_("Day the closing balance applies to."),
+    )
+    closing_balance = models.DecimalField(
+        _("Closing Balance"),
+        max_digits=12,
+        decimal_places=2,
+        help_text=_("Wallet balance at the end of the day."),
+    )
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name = _("Wallet Snapshot")
+        verbose_name_plural = _("Wallet Snapshots")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["wallet", "date"],
+                name="unique_wallet_snapshot_per_day",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Snapshot: {self.wallet} - ₦{self.closing_balance} ({self.date})"
@@ -0,0 +1,133 @@
+"""Reconciliation of wallet balances against their audit logs."""
+
+import logging
+from decimal import Decimal
+
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogRollup, ReconciliationRun, Wallet
+
+logger = logging.getLogger(__name__)
+
+RECONCILIATION_CHUNK_SIZE = 2000
+
+
+def expected_balances(wallets):
+    """
+    Annotate wallets with the balance implied by their audit logs.
+
+    The signed sum of every wallet's audit logs is computed by the database
+    in a single grouped query, together with the totals of the months that
+    were archived.
+    """
+    amount = DecimalField(max_digits=14, decimal_places=2)
+    archived = (
+        AuditLogRollup.objects.filter(wallet=OuterRef("pk"))
+        .order_by()
+        .values("wallet")
+        .annotate(total=Sum(F("credits") - F("debits")))
+        .values("total")
+    )
+    return wallets.annotate(
+        expected_balance=Coalesce(Subquery(archived), Value(Decimal("0.00")))
+        + Coalesce(
+            Sum(
+                Case(
+                    When(
+                        audit_logs__transaction_type__in=AuditLog.DEBIT_TYPES,
+                        then=-F("audit_logs__amount"),
+                    ),
+                    default=F("audit_logs__amount"),
+                    output_field=amount,
+                )
+            ),
+            Value(Decimal("0.00")),
+            output_field=amount,
+        )
+    )
+
+
+def touched_wallets(since):
+    """Return the wallets changed or given audit logs after a completed run."""
+    return Wallet.objects.filter(
+        Q(updated__gte=since.created)
+        | Q(
+            pk__in=AuditLog.objects.filter(pk__gt=since.last_audit_log_id).values(
+                "wallet_id"
+            )
+        )
+    )
+
+
+def reconcile_wallets(
+    incremental=False, chunk_size=RECONCILIATION_CHUNK_SIZE, report=None
+):
+    """
+    Compare every wallet balance with the sum of its audit logs.
+
+    The grouped results are streamed with a server-side cursor where the
+    database supports it, so the audit log table is never held in memory.
+    A single query also reads every balance and its audit logs from the same
+    snapshot, so transactions committing during the run cause no false drift.
+
+    Args:
+        incremental (bool): Only check the wallets touched since the last
+            completed run. A full run is made when there is none.
+        chunk_size (int): Number of wallets fetched per round trip.
+        report (callable): Optional callback receiving (wallet pk, user email,
+            balance, expected balance) for every drifted wallet.
+
+    Returns:
+        ReconciliationRun: The completed run.
+    """
+    previous = None
+    if incremental:
+        previous = (
+            ReconciliationRun.objects.filter(completed_at__isnull=False)
+            .order_by("-created")
+            .first()
+        )
+
+    run = ReconciliationRun.objects.create(
+        mode=ReconciliationRun.Mode.INCREMENTAL
+        if previous
+        else ReconciliationRun.Mode.FULL,
+        last_audit_log_id=AuditLog.objects.aggregate(last=Max("pk"))["last"] or 0,
+    )
+    wallets = touched_wallets(previous) if previous else Wallet.objects.all()
+
+    rows = (
+        expected_balances(wallets)
+        .order_by("pk")
+        .values_list("pk", "user__email", "balance", "expected_balance")
+    )
+    for wallet_pk, email, balance, expected in rows.iterator(chunk_size=chunk_size):
+        run.wallets_checked += 1
+        expected = Decimal(expected).quantize(Decimal("0.01"))
+        drift = balance - expected
+        if drift:
+            run.drifted_wallets += 1
+            run.total_drift += abs(drift)
+            logger.warning(
+                f"Wallet {wallet_pk} balance {balance} differs from its audit logs "
+                f"by {drift}."
+            )
+            if report:
+                report(wallet_pk, email, balance, expected)
+
+    run.completed_at = timezone.now()
+    run.save()
+    return run
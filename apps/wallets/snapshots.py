@@ -0,0 +1,82 @@
+"""Daily closing balance snapshots built from the audit logs."""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AuditLog, WalletSnapshot, start_of_day
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_BATCH_SIZE = 2000
+
+
+def next_snapshot_date():
+    """Return the first day without snapshots, or None if there are no logs."""
+    latest = WalletSnapshot.objects.aggregate(latest=Max("date"))["latest"]
+    if latest:
+        return latest + timedelta(days=1)
+    first = AuditLog.objects.order_by("created").values_list("created", flat=True)
+    first = first.first()
+    return timezone.localdate(first) if first else None
+
+
+def build_snapshots(start, end, batch_size=SNAPSHOT_BATCH_SIZE):
+    """
+    Write the closing balance of every wallet with transactions on each day
+    from start to end, both inclusive.
+
+    The last audit log of each wallet per day is found in one grouped query
+    and its balance after is stored, so only the audit logs of those days
+    are read. Existing snapshots of the same days are overwritten.
+
+    Returns:
+        int: Number of snapshots written.
+    """
+    last_logs = (
+        AuditLog.objects.filter(
+            created__gte=start_of_day(start),
+            created__lt=start_of_day(end, days=1),
+        )
+        .annotate(day=TruncDate("created"))
+        .values("wallet_id", "day")
+        .annotate(last=Max("pk"))
+        .values("last")
+    )
+    closing = (
+        AuditLog.objects.filter(pk__in=last_logs)
+        .annotate(day=TruncDate("created"))
+        .order_by("pk")
+        .values_list("wallet_id", "day", "balance_after")
+    )
+
+    written = 0
+    batch = []
+    for wallet_pk, day, balance in closing.iterator(chunk_size=batch_size):
+        batch.append(
+            WalletSnapshot(wallet_id=wallet_pk, date=day, closing_balance=balance)
+        )
+        if len(batch) >= batch_size:
+            written += save_snapshots(batch)
+            batch = []
+    if batch:
+        written += save_snapshots(batch)
+
+    logger.info(f"Wrote {written} wallet snapshots from {start} to {end}.")
+    return written
+
+
+def save_snapshots(snapshots):
+    """Insert snapshots, replacing the closing balance of existing ones."""
+    with transaction.atomic():
+        WalletSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=["wallet", "date"],
+            update_fields=["closing_balance", "updated"],
+        )
+    return len(snapshots)
@@ -6,7 +6,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.sites.shortcuts import get_current_site
 from django.template.loader import render_to_string
 
-from apps.core.utils import send_email_thread
+from apps.core.utils import queue_email
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -45,7 +45,7 @@ def send_deposit_email(request, deposit):
             },
         )
 
-        send_email_thread(
+        queue_email(
             subject,
             text_message,
             html_message,
@@ -87,7 +87,7 @@ def send_withdrawal_email(request, withdrawal):
             context,
         )
 
-        send_email_thread(
+        queue_email(
             subject,
             text_message,
             html_message,
@@ -1,9 +1,12 @@
-"""Utility functions for handling payments with Paystack API."""
+"""Utility functions for handling payments with Paystack API and wallets."""
 
 import logging
 import requests
 
 from django.conf import settings
+from django.http import Http404
+
+from .models import Wallet
 
 logger = logging.getLogger(__name__)
 
@@ -52,3 +55,16 @@ def initialize_paystack_transaction(user, amount, reference, callback_url):
         logger.error(f"Error decoding JSON response: {e}")
 
     return None
+
+
+def get_user_wallet(request):
+    """
+    Return the logged-in user's wallet without a query.
+
+    The authentication backends load the wallet along with the user, so it
+    is read from request.user for the rest of the request.
+    """
+    try:
+        return request.user.wallet
+    except Wallet.DoesNotExist:
+        raise Http404("No Wallet matches the given query.")
@@ -16,7 +16,7 @@ from apps.core.utils import create_action, mk_paginator
 from .forms import DepositForm, TransactionPINForm, WithdrawalForm
 from .models import Deposit, Withdrawal
 from .tasks import send_deposit_email, send_withdrawal_email
-from .utils import verify_paystack_transaction
+from .utils import get_user_wallet, verify_paystack_transaction
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +54,7 @@ def wallet_deposit(request):
         try:
             deposit = form.save(commit=False)
             deposit.user = request.user
-            deposit.wallet = request.user.wallet
+            deposit.wallet = get_user_wallet(request)
             deposit.reference = get_random_string(length=12).upper()
             deposit.save()
 
@@ -66,7 +66,7 @@ def wallet_deposit(request):
     template = "wallets/deposit.html"
     context = {
         "form": form,
-        "wallet_balance": request.user.wallet.balance,
+        "wallet_balance": get_user_wallet(request).balance,
     }
     return render(request, template, context)
 
@@ -168,7 +168,7 @@ def wallet_invoice(request):
             request.user,
             "Wallet Top-up",
             f"has made a wallet deposit of ₦{deposit.amount}.",
-            target=request.user.wallet,
+            target=get_user_wallet(request),
         )
 
         template = "wallets/invoice.html"
@@ -209,7 +209,7 @@ def wallet_withdrawal(request):
         messages.error(request, "You need a wallet before making a withdrawal.")
         return redirect("bettor:dashboard")
 
-    user_wallet = request.user.wallet
+    user_wallet = get_user_wallet(request)
 
     if request.method == "POST":
         form = WithdrawalForm(
@@ -267,7 +267,7 @@ def wallet_withdrawal_pin(request):
             else:
                 try:
                     # Create withdrawal record
-                    user_wallet = request.user.wallet
+                    user_wallet = get_user_wallet(request)
                     reference = get_random_string(length=12).upper()
                     withdrawal = Withdrawal.objects.create(
                         user=request.user,
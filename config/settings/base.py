@@ -115,9 +115,72 @@ CELERY_ACCEPT_CONTENT = ["application/json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 
+# Shared cache of all processes, e.g. redis://localhost:6379/1. Without it
+# each process keeps its own in-memory cache.
+CACHE_URL = config("CACHE_URL", default="")
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+        if CACHE_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
+# Number of parallel jobs a bundle settlement is split into
+SETTLEMENT_PARTITIONS = config("SETTLEMENT_PARTITIONS", default=4, cast=int)
+
+# Audit logs older than this many whole months are moved to archive files
+AUDITLOG_RETENTION_MONTHS = config("AUDITLOG_RETENTION_MONTHS", default=12, cast=int)
+AUDITLOG_ARCHIVE_DIR = config(
+    "AUDITLOG_ARCHIVE_DIR", default=str(BASE_DIR / "archive" / "auditlog")
+)
+
 MAILJET_API_KEY = config("MJ_APIKEY_PUBLIC")
 MAILJET_SECRET_KEY = config("MJ_APIKEY_PRIVATE")
 MAILJET_SENDER_NAME = config("MAILJET_SENDER_NAME")
+# Base URL of the Mailjet API, which can point at a local stub in development
+MAILJET_API_URL = config("MAILJET_API_URL", default="https://api.mailjet.com/")
+
+# Delivery of the email outbox: emails per batch, attempts before an email
+# is marked failed, and the first retry delay in seconds (doubled each time)
+EMAIL_OUTBOX_BATCH_SIZE = config("EMAIL_OUTBOX_BATCH_SIZE", default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config("EMAIL_OUTBOX_RETRY_DELAY", default=60, cast=int)
+
+# Immediate sending pool of each process: worker threads, emails waiting for
+# a worker, and what happens when the queue is full ("spill" writes the email
+# to the outbox, "block" waits up to EMAIL_DISPATCH_BLOCK_TIMEOUT seconds)
+EMAIL_DISPATCH_WORKERS = config("EMAIL_DISPATCH_WORKERS", default=4, cast=int)
+EMAIL_DISPATCH_QUEUE_SIZE = config("EMAIL_DISPATCH_QUEUE_SIZE", default=100, cast=int)
+EMAIL_DISPATCH_WHEN_FULL = config("EMAIL_DISPATCH_WHEN_FULL", default="spill")
+EMAIL_DISPATCH_BLOCK_TIMEOUT = config(
+    "EMAIL_DISPATCH_BLOCK_TIMEOUT", default=10, cast=float
+)
+
+# Minutes of logins from known devices gathered into one login alert digest
+LOGIN_DIGEST_WINDOW = config("LOGIN_DIGEST_WINDOW", default=60, cast=int)
+# Login history older than this many days is rolled up per user and day
+LOGIN_HISTORY_RETENTION_DAYS = config(
+    "LOGIN_HISTORY_RETENTION_DAYS", default=90, cast=int
+)
+
+# Location of login IP addresses: backend class, path of the MaxMind city
+# database it reads (.mmdb), and number of /24 networks cached per process
+GEOIP_BACKEND = config(
+    "GEOIP_BACKEND", default="apps.accounts.geolocation.MaxMindBackend"
+)
+GEOIP_DATABASE = config("GEOIP_DATABASE", default="")
+GEOIP_CACHE_SIZE = config("GEOIP_CACHE_SIZE", default=4096, cast=int)
+# Look unresolved logins up on ipinfo.io in a background task
+GEOIP_REMOTE_LOOKUP = config("GEOIP_REMOTE_LOOKUP", default=True, cast=bool)
+GEOIP_REMOTE_TIMEOUT = config("GEOIP_REMOTE_TIMEOUT", default=3, cast=float)
+
+# Requests running more SQL queries than this are logged as warnings by
+# QueryBudgetMiddleware in development and testing
+QUERY_BUDGET_WARN = config("QUERY_BUDGET_WARN", default=30, cast=int)
 
 LOGGING = {
     "version": 1,
@@ -139,7 +202,11 @@ LOGGING = {
     },
 }
 
+# Both backends load the user's profile and wallet along with the user
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
+    "apps.accounts.authentication.UserModelBackend",
     "apps.accounts.authentication.EmailAuthenticationBackend",
+    # Still resolves sessions logged in before UserModelBackend replaced it;
+    # remove once those have expired (SESSION_COOKIE_AGE, two weeks).
+    "django.contrib.auth.backends.ModelBackend",
 ]
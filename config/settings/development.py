@@ -5,10 +5,16 @@ DEBUG = True
 
 ALLOWED_HOSTS = config("ALLOWED_HOSTS", cast=Csv())
 
+# Count the queries of each request, see QueryBudgetMiddleware
+MIDDLEWARE = ["apps.core.middleware.QueryBudgetMiddleware", *MIDDLEWARE]
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Take the write lock when a transaction starts, so parallel settlement
+        # workers wait for each other instead of failing with "database is locked".
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
     }
 }
 
@@ -4,6 +4,9 @@ DEBUG = False
 
 ALLOWED_HOSTS = ["*"]
 
+# Count the queries of each request, see QueryBudgetMiddleware
+MIDDLEWARE = ["apps.core.middleware.QueryBudgetMiddleware", *MIDDLEWARE]
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",